@@ -0,0 +1,104 @@
+"""
+Benchmarks of meteor_trajectory_reader.read_data on synthetic meteor trajectory files.
+
+Run with: nox --session=benchmarks
+"""
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+import pandas as pd  # type: ignore
+import pytest
+
+from gmn_python_api import meteor_trajectory_reader
+from gmn_python_api.meteor_trajectory_schema import _MODEL_METEOR_TRAJECTORY_FILE_PATH
+
+ROUNDS = 3
+"""The number of times each benchmark is run."""
+
+
+def test_read_data(benchmark: Any, trajectory_file: Path) -> None:
+    """
+    Benchmark: read_data on a synthetic file path.
+    Records: The time per call, the throughput in rows and megabytes per second, and the
+     peak memory allocated while reading.
+    """
+    dataframe = benchmark.pedantic(
+        meteor_trajectory_reader.read_data, args=(trajectory_file,), rounds=ROUNDS)
+
+    rows = len(dataframe)
+    megabytes = trajectory_file.stat().st_size / 1e6
+    seconds = benchmark.stats.stats.min
+    benchmark.extra_info["rows"] = rows
+    benchmark.extra_info["rows_per_second"] = rows / seconds
+    benchmark.extra_info["megabytes_per_second"] = megabytes / seconds
+    benchmark.extra_info["peak_memory_megabytes"] = _get_peak_memory(trajectory_file)
+
+
+def test_set_data_types(benchmark: Any, trajectory_file: Path) -> None:
+    """
+    Benchmark: _set_data_types on the parsed columns of a synthetic file.
+    Records: The time per call and the throughput in rows per second, to compare with
+     the time per call of test_read_data.
+    """
+    with meteor_trajectory_reader._open_text_stream(trajectory_file) as text_stream:
+        header_lines, csv_stream = meteor_trajectory_reader._read_text_stream_header(
+            text_stream)
+        dataframe = meteor_trajectory_reader._read_csv(csv_stream, header_lines)
+
+    def setup() -> Tuple[Tuple[pd.DataFrame], Dict[str, Any]]:
+        return (dataframe.copy(),), {}
+
+    benchmark.pedantic(
+        meteor_trajectory_reader._set_data_types, setup=setup, rounds=ROUNDS)
+
+    benchmark.extra_info["rows"] = len(dataframe)
+    benchmark.extra_info["rows_per_second"] = len(dataframe) / benchmark.stats.stats.min
+
+
+def _read_data_python_parser(data: str) -> pd.DataFrame:
+    """
+    Reads meteor trajectory data with the python parser, as read_data did before the C
+     parser path was added.
+
+    :param data: The meteor trajectory CSV string.
+    :return: Pandas DataFrame of the meteor trajectory data.
+    """
+    dataframe = meteor_trajectory_reader._read_csv_python(data, False)
+    meteor_trajectory_reader._set_data_types(dataframe)
+    return dataframe
+
+
+@pytest.mark.parametrize("read", [_read_data_python_parser,
+                                  meteor_trajectory_reader.read_data],
+                         ids=["python_parser", "read_data"])
+def test_read_model_file(
+        benchmark: Any, read: Callable[[str], pd.DataFrame]
+) -> None:
+    """
+    Benchmark: read_data against the python parser it replaced on the bundled model
+     meteor trajectory file.
+    Records: The time per call of each parser, grouped to compare them.
+    """
+    data = _MODEL_METEOR_TRAJECTORY_FILE_PATH.read_text()
+    benchmark.group = "model file"
+    dataframe = benchmark.pedantic(read, args=(data,), rounds=ROUNDS)
+
+    pd.testing.assert_frame_equal(meteor_trajectory_reader.read_data(data), dataframe)
+
+
+def _get_peak_memory(trajectory_file: Path) -> float:
+    """
+    Gets the peak memory allocated by read_data on a file, as traced by tracemalloc.
+
+    :param trajectory_file: The path of the meteor trajectory file.
+    :return: The peak memory in megabytes.
+    """
+    tracemalloc.start()
+    try:
+        meteor_trajectory_reader.read_data(trajectory_file)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak / 1e6
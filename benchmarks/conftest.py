@@ -0,0 +1,29 @@
+"""
+Fixtures for the meteor_trajectory_reader benchmarks.
+
+The sizes of the synthetic files can be set with the GMN_BENCHMARK_ROWS environment
+ variable e.g. GMN_BENCHMARK_ROWS=10000,100000.
+"""
+import os
+from pathlib import Path
+
+import pytest
+
+from synthetic_data import get_trajectory_file
+
+BENCHMARK_ROWS = [
+    int(rows) for rows in os.environ.get(
+        "GMN_BENCHMARK_ROWS", "10000,100000,1000000").split(",")
+]
+"""The number of data rows in each synthetic meteor trajectory file."""
+
+
+@pytest.fixture(scope="session", params=BENCHMARK_ROWS, ids=lambda rows: f"{rows}rows")
+def trajectory_file(request: pytest.FixtureRequest) -> Path:
+    """
+    A synthetic meteor trajectory file in the GMN data directory layout.
+
+    :param request: The pytest request, with the number of rows as the param.
+    :return: The path of the synthetic meteor trajectory file.
+    """
+    return get_trajectory_file(request.param)
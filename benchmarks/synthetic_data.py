@@ -0,0 +1,81 @@
+"""
+Generates synthetic meteor trajectory files in the GMN data directory layout for the
+ benchmarks, by repeating the data rows of the bundled model meteor trajectory file.
+"""
+import string
+from pathlib import Path
+
+from gmn_python_api.meteor_trajectory_schema import _MODEL_METEOR_TRAJECTORY_FILE_PATH
+
+DATA_DIRECTORY = Path(".benchmarks", "data")
+"""The directory the synthetic files are kept in, so they are only generated once."""
+
+_HEADER_LINE_COUNT = 4
+"""The number of comment and column header lines at the top of the model file."""
+
+_IDENTIFIER_CHARACTERS = (string.digits + string.ascii_letters).encode()
+"""The characters of the random part of a unique trajectory identifier."""
+
+_IDENTIFIER_SUFFIX_LENGTH = 5
+"""The length of the random part of a unique trajectory identifier e.g. yrPTs."""
+
+
+def get_trajectory_file(rows: int) -> Path:
+    """
+    Gets the path of a synthetic meteor trajectory file with the given number of rows,
+     generating it if it doesn't exist yet.
+
+    :param rows: The number of data rows in the file.
+    :return: The path of the synthetic meteor trajectory file.
+    """
+    path = DATA_DIRECTORY / f"traj_summary_synthetic_{rows}.txt"
+    if not path.exists():
+        DATA_DIRECTORY.mkdir(parents=True, exist_ok=True)
+        partial_path = path.with_suffix(".part")
+        write_trajectory_file(partial_path, rows)
+        partial_path.replace(path)
+
+    return path
+
+
+def write_trajectory_file(path: Path, rows: int) -> None:
+    """
+    Writes a synthetic meteor trajectory file. The data rows of the model file are
+     repeated in order, and the random part of each unique trajectory identifier is
+     replaced with the row number so that every identifier is unique.
+
+    :param path: The path to write the file to.
+    :param rows: The number of data rows to write.
+    :return: None.
+    """
+    lines = _MODEL_METEOR_TRAJECTORY_FILE_PATH.read_bytes().split(b"\n")
+    header_lines = lines[:_HEADER_LINE_COUNT]
+    data_lines = [line for line in lines[_HEADER_LINE_COUNT:] if line.strip()]
+
+    # Data lines start with "\r" then the 20 character identifier e.g.
+    # 20220304220741_yrPTs, of which the last 5 characters are random.
+    suffix_start = 1 + 20 - _IDENTIFIER_SUFFIX_LENGTH
+    suffix_end = 1 + 20
+
+    with open(path, "wb") as file:
+        file.write(b"\n".join(header_lines) + b"\n")
+        for row in range(rows):
+            line = data_lines[row % len(data_lines)]
+            file.write(line[:suffix_start] + _encode_row_number(row) + line[suffix_end:]
+                       + b"\n")
+
+
+def _encode_row_number(row: int) -> bytes:
+    """
+    Encodes a row number as the random part of a unique trajectory identifier.
+
+    :param row: The row number.
+    :return: The row number in base 62, padded to the length of the random part.
+    """
+    base = len(_IDENTIFIER_CHARACTERS)
+    characters = bytearray()
+    for _ in range(_IDENTIFIER_SUFFIX_LENGTH):
+        row, remainder = divmod(row, base)
+        characters.append(_IDENTIFIER_CHARACTERS[remainder])
+
+    return bytes(reversed(characters))
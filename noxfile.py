@@ -61,7 +61,7 @@ def lint(session: Session) -> None:
 def mypy(session: Session) -> None:
     """Static type-check using mypy."""
     args = session.posargs or ["src", "tests", "docs/conf.py"]
-    session.install(".")
+    session.install(".[parquet,aio,compression,orjson]")
     session.install("mypy", "pytest")
     session.run("mypy", *args)
     if not session.posargs:
@@ -71,7 +71,7 @@ def mypy(session: Session) -> None:
 @session(name="unit-tests", python=python_versions)
 def unit_tests(session: Session) -> None:
     """Run the unit test suite with coverage."""
-    session.install(".")
+    session.install(".[parquet,aio,compression,orjson]")
     session.install("coverage[toml]", "pytest", "pygments")
     try:
         session.run("coverage", "run", "--parallel", "-m", "pytest", "tests/unit",
@@ -104,6 +104,20 @@ def integration_tests(session: Session) -> None:
     session.run("pytest", "tests/integration", *session.posargs)
 
 
+@session(python="3.10")
+def benchmarks(session: Session) -> None:
+    """Run the meteor_trajectory_reader benchmarks and save the results."""
+    session.install(".")
+    session.install("pytest", "pytest-benchmark")
+    session.run(
+        "pytest",
+        "benchmarks",
+        "--override-ini=python_files=bench_*.py",
+        "--benchmark-autosave",
+        *session.posargs,
+    )
+
+
 @session(name="docs-build", python="3.10")
 def docs_build(session: Session) -> None:
     """Build the documentation."""
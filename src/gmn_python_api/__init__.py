@@ -1,6 +1,7 @@
 """GMN Python API."""
 from gmn_python_api.data_directory import *  # noqa: F403
 from gmn_python_api.gmn_rest_api import *  # noqa: F403
+from gmn_python_api.http_transport import *  # noqa: F403
 from gmn_python_api.iau_showers import *  # noqa: F403
 from gmn_python_api.meteor_trajectory_reader import *  # noqa: F403
 from gmn_python_api.meteor_trajectory_schema import *  # noqa: F403
@@ -11,4 +12,5 @@ __all__ = [  # noqa: F405
     "iau_showers",
     "meteor_trajectory_schema",
     "gmn_rest_api",
+    "http_transport",
 ]
@@ -1,12 +1,30 @@
 """Command-line interface."""
+from pathlib import Path
+from typing import Optional
+
 import click
 
+from gmn_python_api import data_directory
+
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.version_option()
 def main() -> None:
     """GMN Python API."""
 
 
+@main.command()
+@click.argument("dest", type=click.Path(file_okay=False, path_type=Path))
+@click.option("--since", help="Skip daily files before this date (YYYY-MM-DD) and "
+              "monthly files before its month.")
+@click.option("--max-workers", default=data_directory.DEFAULT_MAX_WORKERS,
+              show_default=True, help="The maximum number of files to download at once.")
+@click.option("--compress", is_flag=True, help="Store the files gzip compressed.")
+def mirror(dest: Path, since: Optional[str], max_workers: int, compress: bool) -> None:
+    """Mirror the GMN Data Directory to DEST, downloading only new or changed files."""
+    manifest = data_directory.mirror(dest, since, max_workers, compress)
+    click.echo(f"Mirrored {len(manifest)} files to {dest}")
+
+
 if __name__ == "__main__":
     main(prog_name="gmn-python-api")  # pragma: no cover
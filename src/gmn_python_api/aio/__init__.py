@@ -0,0 +1,5 @@
+"""
+Asyncio versions of the GMN Python API modules.
+
+Requires the optional aiohttp dependency (pip install gmn-python-api[aio]).
+"""
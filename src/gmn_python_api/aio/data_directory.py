@@ -0,0 +1,328 @@
+"""
+This module contains asyncio functions to read meteor trajectory files from the GMN Data
+ Directory. They mirror the functions of gmn_python_api.data_directory, but download
+ over a non-blocking aiohttp session so many files can be fetched at once on one event
+ loop.
+
+All functions take an optional aiohttp.ClientSession. Create one with create_session and
+ pass it to every call to reuse connections and limit the number of open connections.
+ Otherwise a new session is created for each call.
+"""
+import asyncio
+import codecs
+import re
+import weakref
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from datetime import timedelta
+from typing import AsyncIterator, Dict, List, Optional
+
+try:
+    import aiohttp
+except ImportError as error:  # pragma: no cover
+    raise ImportError(
+        "aiohttp is required for gmn_python_api.aio. Install it with "
+        "pip install gmn-python-api[aio]"
+    ) from error
+
+from gmn_python_api import data_directory
+from gmn_python_api.data_directory import DAILY_DATE_INPUT_FORMAT, DAILY_DIRECTORY, \
+    MONTHLY_DATE_INPUT_FORMAT, MONTHLY_DIRECTORY, SUMMARY_FILE_EXTENSION, \
+    SUMMARY_TODAY_FILENAME, SUMMARY_YESTERDAY_FILENAME
+
+DEFAULT_CONNECTION_LIMIT: int = 100
+"""The default maximum number of open connections of a session."""
+
+DEFAULT_CONNECTION_LIMIT_PER_HOST: int = 16
+"""The default maximum number of open connections to one host of a session."""
+
+DEFAULT_TIMEOUT: float = 200
+"""The default timeout of a request in seconds."""
+
+_listing_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = \
+    weakref.WeakKeyDictionary()
+"""Locks held while a directory listing is fetched by event loop, so concurrent lookups
+ only fetch the listing once."""
+
+
+def create_session(
+        limit: int = DEFAULT_CONNECTION_LIMIT,
+        limit_per_host: int = DEFAULT_CONNECTION_LIMIT_PER_HOST,
+        timeout: float = DEFAULT_TIMEOUT,
+) -> aiohttp.ClientSession:
+    """
+    Create an aiohttp session for the functions in this module. Requests beyond the
+     connection limits wait for a free connection.
+
+    :param limit: The maximum number of open connections.
+    :param limit_per_host: The maximum number of open connections to one host.
+    :param timeout: The timeout of a request in seconds.
+
+    :return: The session. Use it as an async context manager, or close it when done.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host),
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        raise_for_status=True,
+    )
+
+
+async def get_all_daily_file_urls(
+        session: Optional[aiohttp.ClientSession] = None
+) -> List[str]:
+    """
+    Get all daily meteor trajectory file urls from the GMN Data Directory.
+
+    :param session: Optional session created by create_session.
+
+    :return: A list of all daily file urls.
+    :raises: aiohttp.ClientResponseError if the data directory url doesn't return a 200
+     response.
+    """
+    return await _get_url_paths(
+        data_directory.BASE_URL + DAILY_DIRECTORY, SUMMARY_FILE_EXTENSION, session)
+
+
+async def get_all_monthly_file_urls(
+        session: Optional[aiohttp.ClientSession] = None
+) -> List[str]:
+    """
+    Get all monthly meteor trajectory file urls from the GMN Data Directory.
+
+    :param session: Optional session created by create_session.
+
+    :return: A list of all monthly file urls.
+    :raises: aiohttp.ClientResponseError if the data directory url doesn't return a 200
+     response.
+    """
+    return await _get_url_paths(
+        data_directory.BASE_URL + MONTHLY_DIRECTORY, SUMMARY_FILE_EXTENSION, session)
+
+
+async def get_daily_file_url_by_date(
+        date_str: str,
+        current_date: Optional[date] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+) -> str:
+    """
+    Get the URL of the daily meteor trajectory file for a given date. The directory
+     listing is cached and shared with gmn_python_api.data_directory.
+
+    :param date_str: The date of the daily file to get in the format YYYY-MM-DD.
+    :param current_date: The current date. Defaults to datetime.now().
+    :param session: Optional session created by create_session.
+
+    :return: The URL of the daily file.
+    :raises: FileNotFoundError if the daily file cannot be found. Or
+     aiohttp.ClientResponseError if the data directory url doesn't return a 200
+     response.
+    """
+    date = datetime.strptime(date_str, DAILY_DATE_INPUT_FORMAT).date()
+
+    if not current_date:
+        current_date = datetime.today().date()
+
+    if date == current_date:
+        return data_directory.BASE_URL + DAILY_DIRECTORY + SUMMARY_TODAY_FILENAME
+
+    if date == current_date - timedelta(days=1):
+        return data_directory.BASE_URL + DAILY_DIRECTORY + SUMMARY_YESTERDAY_FILENAME
+
+    daily_file_urls = await _get_listing_index(
+        DAILY_DIRECTORY, data_directory._DAILY_FILENAME_DATE_PATTERN, session)
+    try:
+        return daily_file_urls[date.strftime("%Y%m%d")]
+    except KeyError:
+        raise FileNotFoundError(f"Meteor trajectory file not found for date "
+                                f"{date.strftime(DAILY_DATE_INPUT_FORMAT)}") from None
+
+
+async def get_monthly_file_url_by_month(
+        date_str: str, session: Optional[aiohttp.ClientSession] = None
+) -> str:
+    """
+    Get the URL of the monthly meteor trajectory file for a given month. The directory
+     listing is cached and shared with gmn_python_api.data_directory.
+
+    :param date_str: The date of the monthly file to get in the format YYYY-MM.
+    :param session: Optional session created by create_session.
+
+    :return: The URL of the monthly file.
+    :raises: FileNotFoundError if the monthly file cannot be found. Or
+     aiohttp.ClientResponseError if the data directory url doesn't return a 200
+     response.
+    """
+    date = datetime.strptime(date_str, MONTHLY_DATE_INPUT_FORMAT).date()
+    monthly_file_urls = await _get_listing_index(
+        MONTHLY_DIRECTORY, data_directory._MONTHLY_FILENAME_DATE_PATTERN, session)
+    try:
+        return monthly_file_urls[date.strftime("%Y%m")]
+    except KeyError:
+        raise FileNotFoundError(
+            f"Meteor trajectory file not found for month in date "
+            f"{date.strftime(MONTHLY_DATE_INPUT_FORMAT)}"
+        ) from None
+
+
+async def get_file_content_from_url(
+        file_url: str, session: Optional[aiohttp.ClientSession] = None
+) -> str:
+    """
+    Get the content of a meteor trajectory file from a given URL.
+
+    :param file_url: The URL of the meteor trajectory file.
+    :param session: Optional session created by create_session.
+
+    :return: The content of the file.
+    :raises: aiohttp.ClientResponseError if the file url doesn't return a 200 response.
+    """
+    async with _get_session(session) as client_session:
+        async with client_session.get(file_url) as response:
+            response.raise_for_status()
+            return await response.text(encoding=response.charset or "utf-8")
+
+
+async def get_daily_file_content_by_date(
+        date_str: str,
+        current_date: Optional[date] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+) -> str:
+    """
+    Get the content of the daily meteor trajectory file for a given date.
+
+    :param date_str: The date of the daily file to get in the format YYYY-MM-DD.
+    :param current_date: The current date. Defaults to datetime.now().
+    :param session: Optional session created by create_session.
+
+    :return: The content of the daily file.
+    :raises: FileNotFoundError if the daily file cannot be found. Or
+     aiohttp.ClientResponseError if the data directory url doesn't return a 200
+     response.
+    """
+    async with _get_session(session) as client_session:
+        file_url = await get_daily_file_url_by_date(date_str, current_date, client_session)
+        return await get_file_content_from_url(file_url, client_session)
+
+
+async def get_monthly_file_content_by_date(
+        date_str: str, session: Optional[aiohttp.ClientSession] = None
+) -> str:
+    """
+    Get the content of the monthly meteor trajectory file for a given date.
+
+    :param date_str: The date to get the monthly file for in the format YYYY-MM.
+    :param session: Optional session created by create_session.
+
+    :return: The content of the monthly file.
+    :raises: FileNotFoundError if the monthly file cannot be found. Or
+     aiohttp.ClientResponseError if the data directory url doesn't return a 200
+     response.
+    """
+    async with _get_session(session) as client_session:
+        file_url = await get_monthly_file_url_by_month(date_str, client_session)
+        return await get_file_content_from_url(file_url, client_session)
+
+
+async def get_all_file_content(session: Optional[aiohttp.ClientSession] = None) -> str:
+    """
+    Get the content of the meteor trajectory file containing all data.
+
+    :param session: Optional session created by create_session.
+
+    :return: The content of the file containing all data.
+    :raises: aiohttp.ClientResponseError if the data directory url doesn't return a 200
+     response.
+    """
+    return await get_file_content_from_url(data_directory.get_all_file_url(), session)
+
+
+@asynccontextmanager
+async def _get_session(
+        session: Optional[aiohttp.ClientSession] = None
+) -> AsyncIterator[aiohttp.ClientSession]:
+    """
+    Use the given session, or a new session that's closed on exit.
+
+    :param session: Optional session created by create_session.
+
+    :return: An async context manager of the session.
+    """
+    if session is not None:
+        yield session
+    else:
+        async with create_session() as new_session:
+            yield new_session
+
+
+async def _get_listing_index(
+        directory: str,
+        date_pattern: "re.Pattern[str]",
+        session: Optional[aiohttp.ClientSession] = None,
+) -> Dict[str, str]:
+    """
+    Get an index of the files in a GMN Data Directory listing by the date in their
+     filename. The index is shared with gmn_python_api.data_directory, so it's fetched
+     at most once every data_directory.LISTING_CACHE_TTL seconds.
+
+    :param directory: The directory in the base URL e.g. DAILY_DIRECTORY.
+    :param date_pattern: The pattern matching the date in a filename e.g. 20181209.
+    :param session: Optional session created by create_session.
+
+    :return: A dictionary of the dates in the filenames e.g. 20181209 to the file URLs.
+    :raises: aiohttp.ClientResponseError if the data directory url doesn't return a 200
+     response.
+    """
+    directory_url = data_directory.BASE_URL + directory
+    loop = asyncio.get_running_loop()
+    if loop not in _listing_locks:
+        _listing_locks[loop] = asyncio.Lock()
+
+    # The blocking data_directory._listing_lock isn't taken, as it would block the event
+    # loop. The cached index is read and replaced atomically instead.
+    async with _listing_locks[loop]:
+        index = data_directory._get_cached_listing_index(directory_url)
+        if index is None:
+            file_urls = await _get_url_paths(directory_url, SUMMARY_FILE_EXTENSION, session)
+            index = data_directory._set_cached_listing_index(
+                directory_url, file_urls, date_pattern)
+
+    return index
+
+
+async def _get_url_paths(
+        url: str, ext: str = "", session: Optional[aiohttp.ClientSession] = None
+) -> List[str]:
+    """
+    Get all paths from a directory listing URL. The listing is parsed as it's
+     downloaded.
+
+    :param url: The URL to get the paths from.
+    :param ext: The extension to filter by.
+    :param session: Optional session created by create_session.
+
+    :return: A list of all paths.
+    :raises: aiohttp.ClientResponseError if the URL doesn't return a 200 response.
+    """
+    parser = data_directory._HrefParser()
+    chunks = []
+    async with _get_session(session) as client_session:
+        async with client_session.get(url) as response:
+            response.raise_for_status()
+            decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(
+                errors="replace")
+            try:
+                async for data in response.content.iter_chunked(64 * 1024):
+                    chunk = decoder.decode(data)
+                    chunks.append(chunk)
+                    parser.feed(chunk)
+                parser.feed(decoder.decode(b"", final=True))
+                parser.close()
+                hrefs = parser.hrefs
+            except AssertionError:
+                # html.parser raises AssertionError on some malformed markup
+                async for data in response.content.iter_chunked(64 * 1024):
+                    chunks.append(decoder.decode(data))
+                chunks.append(decoder.decode(b"", final=True))
+                hrefs = data_directory._get_hrefs_with_beautifulsoup("".join(chunks))
+
+    return [url + href for href in hrefs if href.endswith(ext)]
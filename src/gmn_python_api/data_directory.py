@@ -2,13 +2,27 @@
 This module contains functions to read meteor trajectory files from the GMN Data
  Directory.
 """
-from datetime import date, datetime
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, \
+    wait
+from datetime import date, datetime, timezone
 from datetime import timedelta
-from typing import List
-from typing import Optional
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Set, Tuple
+from typing import Optional, Union
 
 import requests
-from bs4 import BeautifulSoup  # type: ignore
+
+from gmn_python_api.http_transport import HttpTransport, get_transport
 
 BASE_URL: str = "https://globalmeteornetwork.org/data/traj_summary_data/"
 """The base URL for meteor trajectory files in the GMN Data Directory."""
@@ -44,6 +58,106 @@ MONTHLY_DATE_INPUT_FORMAT: str = "%Y-%m"
 """The monthly string date format that should be passed in as a parameter to the
  functions in this module."""
 
+DEFAULT_MAX_WORKERS: int = 8
+"""The default number of files downloaded at once by the functions that get the files
+ in a date range."""
+
+DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024
+"""The number of bytes written to disk at a time by download_file."""
+
+DOWNLOAD_RETRIES: int = 3
+"""The default number of times download_file resumes a download after the connection
+ drops."""
+
+GZIP_COMPRESSLEVEL: int = 1
+"""The gzip compression level of cached files and of files downloaded to a ".gz" path.
+ The fastest level, as meteor trajectory files are mostly digits and higher levels
+ only compress them slightly more."""
+
+MANIFEST_FILENAME: str = "manifest.json"
+"""The filename of the manifest of a local mirror of the GMN Data Directory."""
+
+LISTING_CACHE_TTL: float = 3600.0
+"""The number of seconds a directory listing is kept for when resolving the URLs of
+ daily and monthly files. Set to 0 to fetch the listing every time."""
+
+_DAILY_FILENAME_DATE_PATTERN = re.compile(r"(?<!\d)(\d{8})(?!\d)")
+"""Matches the date of a daily file in its filename e.g. 20181209 in
+ traj_summary_20181209_solrange_257.0-258.0.txt."""
+
+_MONTHLY_FILENAME_DATE_PATTERN = re.compile(r"(?<!\d)(\d{6})(?!\d)")
+"""Matches the month of a monthly file in its filename e.g. 201812 in
+ traj_summary_monthly_201812.txt."""
+
+_listing_indexes: Dict[str, Tuple[float, Dict[str, str]]] = {}
+"""The indexes of the directory listings by directory URL, with the time they were
+ fetched."""
+
+_listing_lock = threading.Lock()
+"""Lock held while a directory listing is fetched, so it's only fetched once."""
+
+DEFAULT_CACHE_DIRECTORY: Path = Path.home() / ".cache" / "gmn_python_api"
+"""The default directory of the download cache. See enable_cache."""
+
+DEFAULT_CACHE_MAX_SIZE: int = 2 * 1024 ** 3
+"""The default maximum size of the download cache in bytes (2 GiB)."""
+
+_cache_directory: Optional[Path] = None
+"""The directory of the download cache, or None if the cache is disabled."""
+
+_cache_max_size: int = DEFAULT_CACHE_MAX_SIZE
+"""The maximum size of the download cache in bytes."""
+
+_cache_lock = threading.Lock()
+"""Lock held while the download cache is evicted, so only one thread evicts at once."""
+
+
+def enable_cache(
+        directory: Union[str, "os.PathLike[str]"] = DEFAULT_CACHE_DIRECTORY,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+) -> None:
+    """
+    Enable the on-disk download cache for files from the GMN Data Directory. Files are
+     stored gzip compressed with their ETag and Last-Modified headers, and are
+     revalidated with a conditional GET on each request, so an unchanged file costs a
+     single 304 Not Modified response instead of a full download. The least recently
+     used files are evicted when the cache grows past max_size.
+
+    :param directory: The directory to store cached files in. Defaults to
+     ~/.cache/gmn_python_api.
+    :param max_size: The maximum total size of the compressed cached files in bytes.
+
+    :return: None.
+    """
+    global _cache_directory, _cache_max_size
+    _cache_directory = Path(directory).expanduser()
+    _cache_max_size = max_size
+    _cache_directory.mkdir(parents=True, exist_ok=True)
+
+
+def disable_cache() -> None:
+    """
+    Disable the on-disk download cache. Cached files are kept on disk.
+
+    :return: None.
+    """
+    global _cache_directory
+    _cache_directory = None
+
+
+def clear_cache() -> None:
+    """
+    Delete all files in the on-disk download cache, if it's enabled.
+
+    :return: None.
+    """
+    if _cache_directory is None:
+        return
+
+    with _cache_lock:
+        for path in _cache_directory.glob("*.cache*"):
+            path.unlink(missing_ok=True)
+
 
 def get_all_daily_file_urls() -> List[str]:
     """
@@ -100,16 +214,12 @@ def get_daily_file_url_by_date(
     if date == current_date - timedelta(days=1):
         return BASE_URL + DAILY_DIRECTORY + SUMMARY_YESTERDAY_FILENAME
 
-    all_daily_filenames = get_all_daily_file_urls()
-    files_containing_date = [
-        f for f in all_daily_filenames if date.strftime("%Y%m%d") in f
-    ]
-
-    if len(files_containing_date) == 0:
+    daily_file_urls = _get_listing_index(DAILY_DIRECTORY, _DAILY_FILENAME_DATE_PATTERN)
+    try:
+        return daily_file_urls[date.strftime("%Y%m%d")]
+    except KeyError:
         raise FileNotFoundError(f"Meteor trajectory file not found for date "
-                                f"{date.strftime(DAILY_DATE_INPUT_FORMAT)}")
-
-    return files_containing_date[0]
+                                f"{date.strftime(DAILY_DATE_INPUT_FORMAT)}") from None
 
 
 def get_monthly_file_url_by_month(date_str: str) -> str:
@@ -123,30 +233,46 @@ def get_monthly_file_url_by_month(date_str: str) -> str:
      requests.HTTPError is raised if the file url doesn't return a 200 response.
     """
     date = datetime.strptime(date_str, MONTHLY_DATE_INPUT_FORMAT).date()
-    all_monthly_filenames = get_all_monthly_file_urls()
-    files_containing_date = [
-        f for f in all_monthly_filenames if date.strftime("%Y%m") in f
-    ]
-
-    if len(files_containing_date) == 0:
+    monthly_file_urls = _get_listing_index(MONTHLY_DIRECTORY,
+                                           _MONTHLY_FILENAME_DATE_PATTERN)
+    try:
+        return monthly_file_urls[date.strftime("%Y%m")]
+    except KeyError:
         raise FileNotFoundError(
             f"Meteor trajectory file not found for month in date "
             f"{date.strftime(MONTHLY_DATE_INPUT_FORMAT)}"
-        )
+        ) from None
+
 
-    return files_containing_date[0]
+def clear_listing_cache() -> None:
+    """
+    Clear the cached directory listings used to resolve the URLs of daily and monthly
+     files, so they're fetched again on the next lookup. Listings are otherwise kept for
+     LISTING_CACHE_TTL seconds.
+
+    :return: None.
+    """
+    with _listing_lock:
+        _listing_indexes.clear()
 
 
-def get_file_content_from_url(file_url: str) -> str:
+def get_file_content_from_url(
+        file_url: str, transport: Optional[HttpTransport] = None
+) -> str:
     """
     Get the content of a meteor trajectory file from a given URL.
 
     :param url: The URL of the meteor trajectory file.
+    :param transport: Optional HttpTransport to download the file with. Defaults to
+     http_transport.get_transport().
 
     :return: The content of the file.
     :raises: requests.HTTPError If the file url doesn't return a 200 response.
     """
-    response = requests.get(file_url, timeout=200)
+    if _cache_directory is not None:
+        return _get_cached_file_content_from_url(file_url, _cache_directory, transport)
+
+    response = _http_get(file_url, transport)
     if response.ok:
         return str(response.text)
     else:
@@ -194,9 +320,966 @@ def get_all_file_content() -> str:
     return get_file_content_from_url(file_url)
 
 
+def get_daily_file_contents_by_range(
+        start_date_str: str,
+        end_date_str: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        ordered: bool = True,
+        current_date: Optional[date] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Get the contents of the daily meteor trajectory files for a range of dates. The
+     files are downloaded in parallel over the pooled connections of the HTTP
+     transport (see http_transport). Dates without a daily file are skipped.
+
+    :param start_date_str: The first date of the range in the format YYYY-MM-DD.
+    :param end_date_str: The last date of the range (inclusive) in the format YYYY-MM-DD.
+    :param max_workers: The maximum number of files to download at once.
+    :param ordered: If True, the files are yielded in date order. Otherwise, they're
+     yielded as soon as they're downloaded.
+    :param current_date: The current date. Defaults to datetime.now().
+
+    :return: An iterator of tuples of the date in the format YYYY-MM-DD and the content
+     of the daily file.
+    :raises: requests.HTTPError if the data directory url doesn't return a 200 response.
+    """
+    start_date = datetime.strptime(start_date_str, DAILY_DATE_INPUT_FORMAT).date()
+    end_date = datetime.strptime(end_date_str, DAILY_DATE_INPUT_FORMAT).date()
+
+    file_urls = []
+    for day in range((end_date - start_date).days + 1):
+        date_str = (start_date + timedelta(days=day)).strftime(DAILY_DATE_INPUT_FORMAT)
+        try:
+            file_urls.append((date_str, get_daily_file_url_by_date(date_str, current_date)))
+        except FileNotFoundError:
+            continue
+
+    return _get_file_contents_from_urls(file_urls, max_workers, ordered)
+
+
+def get_monthly_file_contents_by_range(
+        start_date_str: str,
+        end_date_str: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        ordered: bool = True,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Get the contents of the monthly meteor trajectory files for a range of months. The
+     files are downloaded in parallel over the pooled connections of the HTTP
+     transport (see http_transport). Months without a monthly file are skipped.
+
+    :param start_date_str: The first month of the range in the format YYYY-MM.
+    :param end_date_str: The last month of the range (inclusive) in the format YYYY-MM.
+    :param max_workers: The maximum number of files to download at once.
+    :param ordered: If True, the files are yielded in month order. Otherwise, they're
+     yielded as soon as they're downloaded.
+
+    :return: An iterator of tuples of the month in the format YYYY-MM and the content of
+     the monthly file.
+    :raises: requests.HTTPError if the data directory url doesn't return a 200 response.
+    """
+    start_date = datetime.strptime(start_date_str, MONTHLY_DATE_INPUT_FORMAT).date()
+    end_date = datetime.strptime(end_date_str, MONTHLY_DATE_INPUT_FORMAT).date()
+
+    file_urls = []
+    for month in range((end_date.year - start_date.year) * 12
+                       + end_date.month - start_date.month + 1):
+        year, month_index = divmod(start_date.month - 1 + month, 12)
+        date_str = date(start_date.year + year, month_index + 1, 1).strftime(
+            MONTHLY_DATE_INPUT_FORMAT)
+        try:
+            file_urls.append((date_str, get_monthly_file_url_by_month(date_str)))
+        except FileNotFoundError:
+            continue
+
+    return _get_file_contents_from_urls(file_urls, max_workers, ordered)
+
+
+def plan_range(
+        start_date_str: str,
+        end_date_str: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        current_date: Optional[date] = None,
+) -> List[Tuple[str, str]]:
+    """
+    Plan the downloads of the meteor trajectory files covering a range of dates with the
+     fewest bytes. For each month in the range, the monthly file is chosen if it's
+     smaller than the daily files of the days of the month in the range, or if there
+     are no daily files for them, otherwise the daily files are chosen. The sizes of
+     the files are requested with HEAD requests in parallel. Daily files are always
+     chosen for a month if the range includes today or yesterday, whose data may not be
+     in the monthly file yet.
+
+    :param start_date_str: The first date of the range in the format YYYY-MM-DD.
+    :param end_date_str: The last date of the range (inclusive) in the format YYYY-MM-DD.
+    :param max_workers: The maximum number of HEAD requests to send at once.
+    :param current_date: The current date. Defaults to datetime.now().
+
+    :return: A list of tuples of the date of the file, in the format YYYY-MM for a
+     monthly file or YYYY-MM-DD for a daily file, and the file URL, in date order. A
+     monthly file also contains the data of the days of its month outside the range.
+    :raises: requests.HTTPError if the data directory url doesn't return a 200 response.
+    """
+    start_date = datetime.strptime(start_date_str, DAILY_DATE_INPUT_FORMAT).date()
+    end_date = datetime.strptime(end_date_str, DAILY_DATE_INPUT_FORMAT).date()
+    if not current_date:
+        current_date = datetime.today().date()
+
+    daily_file_urls_by_month = _get_daily_file_urls_by_month(
+        start_date, end_date, current_date)
+
+    # The data of today and yesterday may not be in the monthly file yet
+    recent_month_strs = {
+        recent_date.strftime(MONTHLY_DATE_INPUT_FORMAT)
+        for recent_date in [current_date, current_date - timedelta(days=1)]
+        if start_date <= recent_date <= end_date
+    }
+    monthly_file_urls: Dict[str, str] = {}
+    for month_str in daily_file_urls_by_month:
+        if month_str not in recent_month_strs:
+            try:
+                monthly_file_urls[month_str] = get_monthly_file_url_by_month(month_str)
+            except FileNotFoundError:
+                continue
+
+    file_sizes = _get_file_sizes(
+        list(monthly_file_urls.values())
+        + [file_url for month_str in monthly_file_urls
+           for _, file_url in daily_file_urls_by_month[month_str]],
+        max_workers,
+    )
+
+    plan = []
+    for month_str, daily_file_urls in daily_file_urls_by_month.items():
+        # Without daily files, the monthly file is the only file with the data
+        if month_str in monthly_file_urls and (not daily_file_urls or _is_smaller(
+                file_sizes[monthly_file_urls[month_str]],
+                [file_sizes[file_url] for _, file_url in daily_file_urls])):
+            plan.append((month_str, monthly_file_urls[month_str]))
+        else:
+            plan.extend(daily_file_urls)
+
+    return plan
+
+
+def get_file_contents_by_range(
+        start_date_str: str,
+        end_date_str: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        ordered: bool = True,
+        current_date: Optional[date] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Get the contents of the daily and monthly meteor trajectory files covering a range
+     of dates, downloading the fewest bytes. The files are chosen by plan_range and
+     downloaded in parallel over the pooled connections of the HTTP transport. Monthly
+     files also contain the data of the days of their month outside the range, so
+     filter the data by date after reading it.
+
+    :param start_date_str: The first date of the range in the format YYYY-MM-DD.
+    :param end_date_str: The last date of the range (inclusive) in the format YYYY-MM-DD.
+    :param max_workers: The maximum number of files to download at once.
+    :param ordered: If True, the files are yielded in date order. Otherwise, they're
+     yielded as soon as they're downloaded.
+    :param current_date: The current date. Defaults to datetime.now().
+
+    :return: An iterator of tuples of the date of the file, in the format YYYY-MM for a
+     monthly file or YYYY-MM-DD for a daily file, and the content of the file.
+    :raises: requests.HTTPError if the data directory url doesn't return a 200 response.
+    """
+    return _get_file_contents_from_urls(
+        plan_range(start_date_str, end_date_str, max_workers, current_date),
+        max_workers, ordered)
+
+
+def download_file(
+        file_url: str,
+        path: Union[str, "os.PathLike[str]"],
+        retries: int = DOWNLOAD_RETRIES,
+        transport: Optional[HttpTransport] = None,
+) -> Path:
+    """
+    Download a file from a given URL to disk. The file is streamed to a ".part" file
+     next to path in chunks, so it's never held in memory. If the connection drops, the
+     download is resumed from the end of the ".part" file with an HTTP Range request,
+     including by a later call after the retries run out. The ETag or Last-Modified date
+     of the file is stored in a ".part.validator" file and sent as the If-Range header,
+     so the download starts again if the file changed in between. The size of the file is
+     checked against the size given by the server before the ".part" file is renamed
+     to path. A ".part" file larger than the file is deleted. If path ends with ".gz",
+     the file is stored gzip compressed. The file can be read with
+     meteor_trajectory_reader.read_data(path), compressed or not.
+
+    :param file_url: The URL of the file.
+    :param path: The path to save the file to.
+    :param retries: The number of times to resume the download after the connection
+     drops.
+    :param transport: Optional HttpTransport to download the file with. Defaults to
+     http_transport.get_transport().
+
+    :return: The path of the downloaded file.
+    :raises: requests.HTTPError if the file url doesn't return a 200 or 206 response. Or
+     OSError if the downloaded file is larger than the size given by the server. Or
+     requests.ConnectionError if the connection drops more than retries times.
+    """
+    path = Path(path)
+    partial_path = path.with_name(path.name + ".part")
+
+    for attempt in range(retries + 1):
+        try:
+            _download_file_part(file_url, partial_path, transport)
+            break
+        except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError):
+            if attempt == retries:
+                raise
+
+    if path.suffix == ".gz":
+        compressing_path = path.with_name(path.name + ".compressing")
+        with open(partial_path, "rb") as file, \
+                gzip.open(compressing_path, "wb",
+                          compresslevel=GZIP_COMPRESSLEVEL) as compressed_file:
+            shutil.copyfileobj(file, compressed_file, DOWNLOAD_CHUNK_SIZE)
+        os.replace(compressing_path, path)
+        partial_path.unlink()
+    else:
+        os.replace(partial_path, path)
+    _write_validator(_get_validator_path(partial_path), None)
+
+    return path
+
+
+def download_all_file(
+        path: Union[str, "os.PathLike[str]"],
+        retries: int = DOWNLOAD_RETRIES,
+        transport: Optional[HttpTransport] = None,
+) -> Path:
+    """
+    Download the meteor trajectory file containing all data to disk. See download_file.
+
+    :param path: The path to save the file to.
+    :param retries: The number of times to resume the download after the connection
+     drops.
+    :param transport: Optional HttpTransport to download the file with. Defaults to
+     http_transport.get_transport().
+
+    :return: The path of the downloaded file.
+    :raises: requests.HTTPError if the file url doesn't return a 200 or 206 response. Or
+     OSError if the downloaded file is larger than the size given by the server. Or
+     requests.ConnectionError if the connection drops more than retries times.
+    """
+    return download_file(get_all_file_url(), path, retries, transport)
+
+
+def mirror(
+        dest: Union[str, "os.PathLike[str]"],
+        since: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        compress: bool = False,
+        directories: Tuple[str, ...] = (DAILY_DIRECTORY, MONTHLY_DIRECTORY),
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Mirror the daily and monthly meteor trajectory files of the GMN Data Directory to a
+     local directory. The size and Last-Modified date of each remote file (from a HEAD
+     request) are compared against the manifest of the previous run, and only new or
+     changed files are downloaded, in parallel over the HTTP transport. The manifest
+     is saved in dest as MANIFEST_FILENAME, even if the mirror fails part way, and can
+     be read with get_mirrored_file_paths without using the network.
+
+    :param dest: The local directory to mirror the files to.
+    :param since: Optional date in the format YYYY-MM-DD. Daily files before this date
+     and monthly files before its month are skipped.
+    :param max_workers: The maximum number of files to check and download at once.
+    :param compress: If True, files are stored gzip compressed with a ".gz" suffix.
+    :param directories: The directories of the GMN Data Directory to mirror.
+
+    :return: The manifest, a dictionary of the file paths relative to dest of the remote
+     files e.g. daily/traj_summary_20181209_solrange_257.0-258.0.txt to dictionaries of
+     their url, local path relative to dest, size, last_modified date and date
+     (YYYY-MM-DD for daily files or YYYY-MM for monthly files, None if the filename has
+     no date).
+    :raises: requests.HTTPError if the data directory url doesn't return a 200 response.
+    """
+    dest = Path(dest).expanduser()
+    if since:
+        # Check the format
+        datetime.strptime(since, DAILY_DATE_INPUT_FORMAT)
+    manifest = read_manifest(dest)
+
+    remote_files = []
+    for directory in directories:
+        directory_url = BASE_URL + directory
+        for file_url in _get_url_paths(directory_url, SUMMARY_FILE_EXTENSION):
+            file_date = _get_filename_date(file_url[len(directory_url):])
+            # Dates in the same format compare in order as strings, and the month of a
+            # monthly file is compared with the month of since
+            if since and file_date and file_date < since[:len(file_date)]:
+                continue
+            remote_files.append((directory + file_url[len(directory_url):], file_url,
+                                 file_date))
+
+    transport = get_transport()
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = {
+            executor.submit(_mirror_file, file_url, dest, name, file_date,
+                            manifest.get(name), compress, transport): name
+            for name, file_url, file_date in remote_files
+        }
+        try:
+            for future in as_completed(futures):
+                manifest[futures[future]] = future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            manifest = dict(sorted(manifest.items()))
+            _write_manifest(dest, manifest)
+
+    return manifest
+
+
+def read_manifest(dest: Union[str, "os.PathLike[str]"]) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the manifest of a local mirror of the GMN Data Directory made by mirror.
+
+    :param dest: The local directory of the mirror.
+
+    :return: The manifest. See mirror. Empty if the directory has no manifest.
+    """
+    try:
+        manifest: Dict[str, Dict[str, Any]] = json.loads(
+            Path(dest, MANIFEST_FILENAME).expanduser().read_bytes())["files"]
+    except FileNotFoundError:
+        return {}
+
+    return manifest
+
+
+def get_mirrored_file_paths(
+        dest: Union[str, "os.PathLike[str]"],
+        directory: str = DAILY_DIRECTORY,
+        start_date_str: Optional[str] = None,
+        end_date_str: Optional[str] = None,
+) -> List[Path]:
+    """
+    Get the local paths of mirrored meteor trajectory files from the manifest of a
+     local mirror, without using the network. The paths can be read with
+     meteor_trajectory_reader.read_data or read_many.
+
+    :param dest: The local directory of the mirror.
+    :param directory: The directory of the files e.g. DAILY_DIRECTORY.
+    :param start_date_str: Optional first date of the files in the format YYYY-MM-DD
+     for daily files or YYYY-MM for monthly files.
+    :param end_date_str: Optional last date (inclusive) of the files in the same format.
+
+    :return: The paths of the files with a date in their filename, in date order.
+    """
+    entries = sorted(
+        (entry for name, entry in read_manifest(dest).items()
+         if name.startswith(directory) and entry["date"]
+         and (start_date_str is None or entry["date"] >= start_date_str)
+         and (end_date_str is None or entry["date"] <= end_date_str)),
+        key=lambda entry: str(entry["date"]),
+    )
+    return [Path(dest, entry["path"]).expanduser() for entry in entries]
+
+
+def _mirror_file(
+        file_url: str,
+        dest: Path,
+        name: str,
+        file_date: Optional[str],
+        entry: Optional[Dict[str, Any]],
+        compress: bool,
+        transport: HttpTransport,
+) -> Dict[str, Any]:
+    """
+    Download a file to a local mirror if it's new or has changed since it was mirrored.
+
+    :param file_url: The URL of the file.
+    :param dest: The local directory of the mirror.
+    :param name: The path of the remote file relative to the base URL.
+    :param file_date: The date in the filename in the format YYYY-MM-DD or YYYY-MM.
+    :param entry: The manifest entry of the file from the previous run, if any.
+    :param compress: If True, the file is stored gzip compressed.
+    :param transport: The HttpTransport to download the file with.
+
+    :return: The manifest entry of the file.
+    :raises: requests.HTTPError if the file url doesn't return a 200 response.
+    """
+    size, last_modified = _get_file_info(file_url, transport)
+
+    path = name + ".gz" if compress else name
+    if entry and entry["path"] == path and size is not None and last_modified \
+            and entry["size"] == size and entry["last_modified"] == last_modified \
+            and Path(dest, path).exists():
+        return entry
+
+    Path(dest, path).parent.mkdir(parents=True, exist_ok=True)
+    download_file(file_url, Path(dest, path), transport=transport)
+    return {
+        "url": file_url,
+        "path": path,
+        "size": size,
+        "last_modified": last_modified,
+        "date": file_date,
+    }
+
+
+def _get_file_info(
+        file_url: str, transport: HttpTransport
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Get the size and Last-Modified date of a file with a HEAD request.
+
+    :param file_url: The URL of the file.
+    :param transport: The HttpTransport to send the request with.
+
+    :return: The size of the file in bytes as stored, and its Last-Modified date. Either
+     is None if the server doesn't give it.
+    :raises: requests.HTTPError if the file url doesn't return a 200 response.
+    """
+    # Ask for the size of the file as stored, not of a compressed response
+    response = transport.head(file_url, headers={"Accept-Encoding": "identity"})
+    response.raise_for_status()
+    size = response.headers.get("Content-Length")
+    return int(size) if size else None, response.headers.get("Last-Modified")
+
+
+def _get_file_sizes(
+        file_urls: List[str], max_workers: int
+) -> Dict[str, Optional[int]]:
+    """
+    Get the sizes of files with HEAD requests in a pool of threads sharing the HTTP
+     transport.
+
+    :param file_urls: The URLs of the files.
+    :param max_workers: The maximum number of requests to send at once.
+
+    :return: A dictionary of the file URLs to their sizes in bytes, or None if the
+     server doesn't give the size.
+    :raises: requests.HTTPError if a file url doesn't return a 200 response.
+    """
+    if not file_urls:
+        return {}
+
+    transport = get_transport()
+    with ThreadPoolExecutor(max_workers) as executor:
+        return dict(zip(file_urls, (size for size, _ in executor.map(  # noqa: B905
+            lambda file_url: _get_file_info(file_url, transport), file_urls))))
+
+
+def _get_daily_file_urls_by_month(
+        start_date: date, end_date: date, current_date: date
+) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Get the URLs of the daily files for a range of dates, grouped by month. Dates
+     without a daily file are skipped.
+
+    :param start_date: The first date of the range.
+    :param end_date: The last date of the range (inclusive).
+    :param current_date: The current date.
+
+    :return: A dictionary of each month in the range in the format YYYY-MM to a list of
+     tuples of the date in the format YYYY-MM-DD and the daily file URL.
+    :raises: requests.HTTPError if the data directory url doesn't return a 200 response.
+    """
+    daily_file_urls_by_month: Dict[str, List[Tuple[str, str]]] = {}
+    for day in range((end_date - start_date).days + 1):
+        day_date = start_date + timedelta(days=day)
+        daily_file_urls = daily_file_urls_by_month.setdefault(
+            day_date.strftime(MONTHLY_DATE_INPUT_FORMAT), [])
+        date_str = day_date.strftime(DAILY_DATE_INPUT_FORMAT)
+        try:
+            daily_file_urls.append(
+                (date_str, get_daily_file_url_by_date(date_str, current_date)))
+        except FileNotFoundError:
+            continue
+
+    return daily_file_urls_by_month
+
+
+def _is_smaller(size: Optional[int], sizes: List[Optional[int]]) -> bool:
+    """
+    Check if a file is smaller than the total size of other files. A file of unknown
+     size is assumed to be larger than the others.
+
+    :param size: The size of the file in bytes, or None if it's unknown.
+    :param sizes: The sizes of the other files in bytes, or None if they're unknown.
+
+    :return: True if the file is smaller than the other files.
+    """
+    if size is None:
+        return False
+    if None in sizes:
+        return True
+    return size < sum(size for size in sizes if size is not None)
+
+
+def _write_manifest(dest: Path, manifest: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Write the manifest of a local mirror atomically.
+
+    :param dest: The local directory of the mirror.
+    :param manifest: The manifest. See mirror.
+
+    :return: None.
+    """
+    dest.mkdir(parents=True, exist_ok=True)
+    partial_path = dest / f"{MANIFEST_FILENAME}.part"
+    partial_path.write_text(json.dumps({
+        "updated": datetime.now(timezone.utc).isoformat(),
+        "files": manifest,
+    }, indent=1))
+    os.replace(partial_path, dest / MANIFEST_FILENAME)
+
+
+def _get_filename_date(filename: str) -> Optional[str]:
+    """
+    Get the date in the filename of a daily or monthly file.
+
+    :param filename: The filename e.g. traj_summary_20181209_solrange_257.0-258.0.txt.
+
+    :return: The date in the format YYYY-MM-DD for a daily file or YYYY-MM for a monthly
+     file, or None if the filename has no date.
+    """
+    for pattern, date_format, output_format in [
+        (_DAILY_FILENAME_DATE_PATTERN, "%Y%m%d", DAILY_DATE_INPUT_FORMAT),
+        (_MONTHLY_FILENAME_DATE_PATTERN, "%Y%m", MONTHLY_DATE_INPUT_FORMAT),
+    ]:
+        match = pattern.search(filename)
+        if match:
+            try:
+                return datetime.strptime(match.group(1), date_format).strftime(
+                    output_format)
+            except ValueError:
+                continue
+
+    return None
+
+
+def _download_file_part(
+        file_url: str, partial_path: Path, transport: Optional[HttpTransport] = None
+) -> None:
+    """
+    Download a file, or the rest of it if partial_path already has its start, to
+     partial_path and check its size.
+
+    :param file_url: The URL of the file.
+    :param partial_path: The path of the partly downloaded file.
+    :param transport: Optional HttpTransport to download the file with.
+
+    :return: None.
+    :raises: requests.HTTPError if the file url doesn't return a 200 or 206 response. Or
+     OSError if the downloaded file is larger than the size given by the server. Or
+     requests.ConnectionError if the connection drops before the whole file is
+     downloaded.
+    """
+    validator_path = _get_validator_path(partial_path)
+    offset, validator = _get_partial_download(partial_path)
+    # Ask for the bytes as stored, so the sizes and ranges are of the file itself
+    headers = {"Accept-Encoding": "identity"}
+    if validator is not None:
+        headers["Range"] = f"bytes={offset}-"
+        # The server sends the whole file instead if it changed since the start
+        headers["If-Range"] = validator
+
+    with _http_get(file_url, transport, headers=headers, stream=True) as response:
+        content_range = response.headers.get("Content-Range", "")
+        total_size = content_range.rpartition("/")[2]
+        response_validator = _get_validator(response)
+        if offset and response_validator and response_validator != validator:
+            # The file changed since the start of the download
+            partial_path.unlink()
+            validator_path.unlink()
+            return _download_file_part(file_url, partial_path, transport)
+
+        if offset and response.status_code == 416:
+            if total_size == str(offset):
+                # The previous attempt downloaded the whole file
+                return
+            partial_path.unlink()
+            return _download_file_part(file_url, partial_path, transport)
+
+        if response.status_code == 206 and content_range.startswith(f"bytes {offset}-"):
+            mode = "ab"
+            expected_size = int(total_size) if total_size.isdigit() else None
+        elif response.ok and response.status_code != 206:
+            # The server doesn't support ranges, so start again
+            mode, offset = "wb", 0
+            content_length = response.headers.get("Content-Length")
+            expected_size = int(content_length) if content_length else None
+            _write_validator(validator_path, response_validator)
+        else:
+            response.raise_for_status()
+            raise requests.HTTPError(
+                f"Unexpected {response.status_code} response for {file_url}",
+                response=response)
+
+        with open(partial_path, mode) as file:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                file.write(chunk)
+
+    size = partial_path.stat().st_size
+    if expected_size is not None and size < expected_size:
+        raise requests.ConnectionError(f"Connection closed after {size} of "
+                                       f"{expected_size} bytes of {file_url}.")
+    if expected_size is not None and size > expected_size:
+        partial_path.unlink()
+        _write_validator(validator_path, None)
+        raise OSError(f"Downloaded {size} bytes of {file_url} but expected "
+                      f"{expected_size} bytes.")
+
+
+def _get_validator_path(partial_path: Path) -> Path:
+    """
+    Get the path of the file storing the validator of a partly downloaded file.
+
+    :param partial_path: The path of the partly downloaded file.
+
+    :return: The path of the validator file next to partial_path.
+    """
+    return partial_path.with_name(partial_path.name + ".validator")
+
+
+def _get_partial_download(partial_path: Path) -> Tuple[int, Optional[str]]:
+    """
+    Get the size and the validator of a partly downloaded file to resume the download
+     from. A partly downloaded file without a validator is deleted, as its start can't
+     be checked against the file.
+
+    :param partial_path: The path of the partly downloaded file.
+
+    :return: The size and the validator of the partly downloaded file, or 0 and None if
+     there's nothing to resume.
+    """
+    validator_path = _get_validator_path(partial_path)
+    if not partial_path.exists() or not partial_path.stat().st_size:
+        return 0, None
+    if not validator_path.exists():
+        partial_path.unlink()
+        return 0, None
+    return partial_path.stat().st_size, validator_path.read_text()
+
+
+def _write_validator(validator_path: Path, validator: Optional[str]) -> None:
+    """
+    Store the validator of a partly downloaded file, or delete it if there's none.
+
+    :param validator_path: The path of the validator file.
+    :param validator: The validator, or None.
+
+    :return: None.
+    """
+    if validator:
+        validator_path.write_text(validator)
+    elif validator_path.exists():
+        validator_path.unlink()
+
+
+def _get_validator(response: requests.Response) -> Optional[str]:
+    """
+    Get the validator of the file in a response to send as the If-Range header when
+     resuming the download. Weak ETags can't be used with If-Range, so the Last-Modified
+     date is used instead of them.
+
+    :param response: The response of the file download request.
+
+    :return: The strong ETag or the Last-Modified date of the file, or None if the
+     response has neither.
+    """
+    etag = response.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return str(etag)
+    last_modified = response.headers.get("Last-Modified")
+    return str(last_modified) if last_modified else None
+
+
+def _get_file_contents_from_urls(
+        file_urls: List[Tuple[str, str]], max_workers: int, ordered: bool
+) -> Iterator[Tuple[str, str]]:
+    """
+    Download files in a pool of threads sharing the HTTP transport. At most twice
+     max_workers files are downloaded ahead of the consumer, so memory use stays
+     bounded when the consumer is slower than the downloads.
+
+    :param file_urls: Tuples of a key e.g. the date of the file, and the file URL.
+    :param max_workers: The maximum number of files to download at once.
+    :param ordered: If True, the files are yielded in the order of file_urls. Otherwise,
+     they're yielded as soon as they're downloaded.
+
+    :return: An iterator of tuples of the key and the content of the file.
+    :raises: requests.HTTPError if a file url doesn't return a 200 response.
+    """
+    remaining_file_urls = iter(file_urls)
+    pending: Deque["Future[Tuple[str, str]]"] = deque()
+    transport = get_transport()
+
+    def download(key: str, file_url: str) -> Tuple[str, str]:
+        return key, get_file_content_from_url(file_url, transport)
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        def submit_next() -> None:
+            next_file_url = next(remaining_file_urls, None)
+            if next_file_url is not None:
+                pending.append(executor.submit(download, *next_file_url))
+
+        try:
+            for _ in range(2 * max_workers):
+                submit_next()
+
+            while pending:
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    done: Set["Future[Tuple[str, str]]"] = wait(
+                        pending, return_when=FIRST_COMPLETED).done
+                    future = next(f for f in pending if f in done)
+                    pending.remove(future)
+
+                result = future.result()
+                submit_next()
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _http_get(
+        url: str, transport: Optional[HttpTransport] = None, **kwargs: Any
+) -> requests.Response:
+    """
+    Perform an HTTP GET request with a transport.
+
+    :param url: URL for the HTTP GET request.
+    :param transport: Optional HttpTransport to send the request with. Defaults to
+     http_transport.get_transport().
+    :param kwargs: Keyword arguments of requests.get e.g. headers.
+
+    :return: The response.
+    """
+    return (transport or get_transport()).get(url, **kwargs)
+
+
+def _get_listing_index(directory: str, date_pattern: "re.Pattern[str]") -> Dict[str, str]:
+    """
+    Get an index of the files in a GMN Data Directory listing by the date in their
+     filename. The listing is fetched at most once every LISTING_CACHE_TTL seconds.
+
+    :param directory: The directory in the base URL e.g. DAILY_DIRECTORY.
+    :param date_pattern: The pattern matching the date in a filename e.g. 20181209.
+
+    :return: A dictionary of the dates in the filenames e.g. 20181209 to the file URLs.
+     If two files have the same date, the first file in the listing is used.
+    :raises: requests.HTTPError if the data directory url doesn't return a 200 response.
+    """
+    directory_url = BASE_URL + directory
+    with _listing_lock:
+        index = _get_cached_listing_index(directory_url)
+        if index is None:
+            index = _set_cached_listing_index(
+                directory_url,
+                _get_url_paths(directory_url, SUMMARY_FILE_EXTENSION),
+                date_pattern,
+            )
+
+    return index
+
+
+def _get_cached_listing_index(directory_url: str) -> Optional[Dict[str, str]]:
+    """
+    Get the cached index of a directory listing if it was fetched less than
+     LISTING_CACHE_TTL seconds ago.
+
+    :param directory_url: The URL of the directory.
+
+    :return: The index of the listing, or None if it isn't cached or has expired.
+    """
+    # A single lookup, so it's safe without _listing_lock
+    cached_index = _listing_indexes.get(directory_url)
+    if cached_index is None:
+        return None
+
+    fetched_time, index = cached_index
+    if time.monotonic() - fetched_time >= LISTING_CACHE_TTL:
+        return None
+
+    return index
+
+
+def _set_cached_listing_index(
+        directory_url: str, file_urls: List[str], date_pattern: "re.Pattern[str]"
+) -> Dict[str, str]:
+    """
+    Build the index of a directory listing by the date in the filenames and cache it.
+
+    :param directory_url: The URL of the directory.
+    :param file_urls: The file URLs in the listing.
+    :param date_pattern: The pattern matching the date in a filename e.g. 20181209.
+
+    :return: The index of the listing.
+    """
+    index: Dict[str, str] = {}
+    for file_url in file_urls:
+        match = date_pattern.search(file_url[len(directory_url):])
+        if match:
+            index.setdefault(match.group(1), file_url)
+
+    # The complete index replaces the cached one in a single assignment, so it's safe
+    # without _listing_lock
+    _listing_indexes[directory_url] = (time.monotonic(), index)
+    return index
+
+
+def _get_cached_file_content_from_url(
+        file_url: str, cache_directory: Path, transport: Optional[HttpTransport] = None
+) -> str:
+    """
+    Get the content of a file from a given URL through the on-disk download cache. A
+     cached file is revalidated with If-None-Match and If-Modified-Since headers. A
+     response is only cached if it has an ETag or Last-Modified header.
+
+    :param file_url: The URL of the file.
+    :param cache_directory: The directory of the download cache.
+    :param transport: Optional HttpTransport to download the file with.
+
+    :return: The content of the file.
+    :raises: requests.HTTPError If the file url doesn't return a 200 or 304 response.
+    """
+    content_path, metadata_path = _get_cache_paths(file_url, cache_directory)
+    metadata = _read_cache_metadata(metadata_path, file_url)
+
+    headers = {}
+    if metadata and content_path.exists():
+        if metadata.get("etag"):
+            headers["If-None-Match"] = metadata["etag"]
+        if metadata.get("last_modified"):
+            headers["If-Modified-Since"] = metadata["last_modified"]
+
+    response = _http_get(file_url, transport, headers=headers)
+
+    if headers and response.status_code == 304:
+        try:
+            content = _decompress(content_path.read_bytes()).decode("utf-8")
+        except FileNotFoundError:
+            # Evicted by another thread since it was checked, so download it in full
+            return _get_cached_file_content_from_url(
+                file_url, cache_directory, transport)
+        os.utime(content_path)
+        return content
+
+    if not response.ok:
+        response.raise_for_status()
+        return ""  # pragma: no cover
+
+    content = str(response.text)
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        _write_cache_file(content_path, gzip.compress(
+            content.encode("utf-8"), compresslevel=GZIP_COMPRESSLEVEL))
+        _write_cache_file(metadata_path, json.dumps({
+            "url": file_url,
+            "etag": etag,
+            "last_modified": last_modified,
+        }).encode("utf-8"))
+        _evict_cache(cache_directory, _cache_max_size, keep=content_path)
+
+    return content
+
+
+def _decompress(content: bytes) -> bytes:
+    """
+    Decompress the content of a cached file if it's gzip compressed. Files cached by
+     earlier versions aren't compressed.
+
+    :param content: The content of the cached file.
+
+    :return: The decompressed content.
+    """
+    return gzip.decompress(content) if content.startswith(b"\x1f\x8b") else content
+
+
+def _get_cache_paths(file_url: str, cache_directory: Path) -> Tuple[Path, Path]:
+    """
+    Get the paths of the cached content and metadata of a URL.
+
+    :param file_url: The URL of the file.
+    :param cache_directory: The directory of the download cache.
+
+    :return: The path of the cached content and the path of its metadata.
+    """
+    key = hashlib.sha256(file_url.encode("utf-8")).hexdigest()
+    return (cache_directory / f"{key}.cache",
+            cache_directory / f"{key}.cache.json")
+
+
+def _read_cache_metadata(metadata_path: Path, file_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the metadata of a cached file.
+
+    :param metadata_path: The path of the metadata.
+    :param file_url: The URL of the file, checked against the URL in the metadata.
+
+    :return: The metadata, or None if the file isn't cached.
+    """
+    try:
+        metadata: Dict[str, Any] = json.loads(metadata_path.read_bytes())
+    except (FileNotFoundError, ValueError):
+        return None
+
+    return metadata if metadata.get("url") == file_url else None
+
+
+def _write_cache_file(path: Path, content: bytes) -> None:
+    """
+    Write a file in the download cache atomically, so other threads and processes never
+     read a partly written file.
+
+    :param path: The path of the file.
+    :param content: The content of the file.
+
+    :return: None.
+    """
+    partial_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}"
+                                  f".part")
+    partial_path.write_bytes(content)
+    os.replace(partial_path, path)
+
+
+def _evict_cache(cache_directory: Path, max_size: int, keep: Path) -> None:
+    """
+    Delete the least recently used files in the download cache until its total size is
+     at most max_size. Files are used when they're written or revalidated.
+
+    :param cache_directory: The directory of the download cache.
+    :param max_size: The maximum total size of the cached files in bytes.
+    :param keep: The path of a cached file not to delete e.g. the file just written.
+
+    :return: None.
+    """
+    with _cache_lock:
+        entries = []
+        for path in cache_directory.glob("*.cache"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= max_size:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            path.with_name(path.name + ".json").unlink(missing_ok=True)
+            total_size -= size
+
+
 def _get_url_paths(url: str, ext: str = "") -> List[str]:
     """
-    Get all paths from a directory listing URL.
+    Get all paths from a directory listing URL. The listing is parsed as it's
+     downloaded. If the HTML can't be parsed, it's parsed again with BeautifulSoup.
 
     :param url: The URL to get the paths from.
     :param ext: The extension to filter by.
@@ -204,11 +1287,89 @@ def _get_url_paths(url: str, ext: str = "") -> List[str]:
     :return: A list of all paths.
     :raises: requests.HTTPError if the URL doesn't return a 200 response.
     """
-    response_text = get_file_content_from_url(url)
-    soup = BeautifulSoup(response_text, "html.parser")
-    parent = [
-        url + node.get("href")
-        for node in soup.find_all("a")
-        if node.get("href").endswith(ext)
-    ]
-    return parent
+    parser = _HrefParser()
+    chunks = []
+    try:
+        for chunk in _iter_file_content_from_url(url):
+            chunks.append(chunk)
+            parser.feed(chunk)
+        parser.close()
+        hrefs = parser.hrefs
+    except AssertionError:
+        # html.parser raises AssertionError on some malformed markup
+        hrefs = _get_hrefs_with_beautifulsoup("".join(chunks))
+
+    return [url + href for href in hrefs if href.endswith(ext)]
+
+
+def _iter_file_content_from_url(file_url: str) -> Iterator[str]:
+    """
+    Iterate over the content of a file from a given URL as it's downloaded. If the
+     download cache is enabled, the content is read through the cache in one piece.
+
+    :param file_url: The URL of the file.
+
+    :return: An iterator of the decoded chunks of the content.
+    :raises: requests.HTTPError If the file url doesn't return a 200 response.
+    """
+    if _cache_directory is not None:
+        yield get_file_content_from_url(file_url)
+        return
+
+    with get_transport().get(file_url, stream=True) as response:
+        if not response.ok:
+            response.raise_for_status()
+        if response.encoding is None:
+            response.encoding = "utf-8"
+        for chunk in response.iter_content(chunk_size=64 * 1024, decode_unicode=True):
+            yield chunk if isinstance(chunk, str) else chunk.decode(response.encoding)
+
+
+class _HrefParser(HTMLParser):
+    """
+    Collects the href values of the <a> tags in an HTML document as it's fed.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create the parser.
+        """
+        super().__init__()
+        self.hrefs: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        """
+        Collect the href value of an <a> tag.
+
+        :param tag: The name of the tag.
+        :param attrs: The attributes of the tag.
+
+        :return: None.
+        """
+        if tag == "a":
+            for name, value in attrs:
+                if name == "href" and value is not None:
+                    self.hrefs.append(value)
+                    break
+
+
+def _get_hrefs_with_beautifulsoup(html: str) -> List[str]:
+    """
+    Get the href values of the <a> tags in an HTML document with BeautifulSoup, using
+     the most lenient parser installed (lxml, then html5lib, then html.parser).
+
+    :param html: The HTML document.
+
+    :return: The href values.
+    """
+    # Imported here, as it's only needed for malformed listings and slow to import
+    from bs4 import BeautifulSoup, FeatureNotFound
+
+    for features in ("lxml", "html5lib", "html.parser"):
+        try:
+            soup = BeautifulSoup(html, features)
+            break
+        except FeatureNotFound:
+            continue
+
+    return [str(node.get("href")) for node in soup.find_all("a", href=True)]
@@ -4,15 +4,67 @@ The REST API uses the Datasette API endpoint. More info:
 https://gmn-python-api.readthedocs.io/en/latest/rest_api.html
 """
 
+import gzip
+import hashlib
 import json
-from urllib.parse import urlencode
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from typing import Optional, Tuple, Iterable, Iterator, Any, List, Dict, Union
+
+import pandas as pd  # type: ignore
 import requests
-from typing import Optional, Tuple, Iterable, Any, List, Dict
+
+from gmn_python_api import meteor_trajectory_reader
+from gmn_python_api import meteor_trajectory_schema
+from gmn_python_api.http_transport import get_transport
 
 # GMN_REST_API_DOMAIN = "http://0.0.0.0:8001"  # For local testing
 GMN_REST_API_DOMAIN = "https://explore.globalmeteornetwork.org"
 QUERY_URL = GMN_REST_API_DOMAIN + "/gmn_rest_api?{args}"
 METEOR_SUMMARY_QUERY_URL = GMN_REST_API_DOMAIN + "/gmn_rest_api/meteor_summary?{args}"
+# The unique column that resumable iteration orders by and resumes after
+KEYSET_COLUMN = "unique_trajectory_identifier"
+KEYSET_QUALIFIED_COLUMN = "meteor." + KEYSET_COLUMN
+# The JSON decoders that can be set with set_json_backend
+JSON_BACKENDS = ("json", "orjson")
+# The Datasette data shapes of JSON rows: dicts of column names to values, or lists of
+# values in the order of the response's "columns"
+DATA_SHAPES = ("objects", "arrays")
+# The formats of the data that get_meteor_summary_dataframe can fetch
+DATA_FORMATS = ("json", "csv")
+JSON_CHUNK_SIZE = 64 * 1024
+# The default number of pages held in memory by the query cache
+DEFAULT_QUERY_CACHE_MAX_ENTRIES = 256
+# The default number of seconds the last modified date of the GMN data store is trusted
+# by the query cache before it's checked again
+DEFAULT_QUERY_CACHE_MAX_AGE = 60.0
+# The query used to check the last modified date of the GMN data store
+DATA_STORE_CHECK_SQL = "SELECT 1"
+
+_json_backend = "json"
+_WHITESPACE_PATTERN = re.compile(r"[ \t\n\r]*")
+# Quoted SQL strings and identifiers, which are kept as they are, or runs of whitespace
+_SQL_TOKEN_PATTERN = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")|\s+")
+
+# The query cache of pages by normalized query URL, or None if it's disabled. Each entry
+# is the last modified date of the GMN data store, the rows and the next URL.
+_query_cache: Optional["OrderedDict[str, Tuple[Optional[str], List[Any], Optional[str]]]"] \
+    = None
+_query_cache_max_entries = DEFAULT_QUERY_CACHE_MAX_ENTRIES
+_query_cache_max_age = DEFAULT_QUERY_CACHE_MAX_AGE
+_query_cache_directory: Optional[Path] = None
+# The last modified date of the GMN data store seen last, and when it was seen
+_data_store_last_modified: Optional[str] = None
+_data_store_checked_at: Optional[float] = None
+_query_cache_lock = threading.RLock()
 
 
 class LastModifiedError(Exception):
@@ -22,11 +74,102 @@ class LastModifiedError(Exception):
     pass
 
 
+def set_json_backend(backend: str) -> None:
+    """
+    Set the JSON decoder of GMN REST API responses.
+
+    :param backend: "json" to decode the rows of a response one at a time as it's
+     downloaded with the standard library, so the whole response is never held in
+     memory. Or "orjson" to decode each response in one call with orjson, which is
+     faster but holds the whole response in memory.
+    :raises: ValueError: If the backend isn't one of JSON_BACKENDS.
+    :raises: ImportError: If the backend is "orjson" and orjson isn't installed.
+    :return: None.
+    """
+    global _json_backend
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend {backend}. Use one of {JSON_BACKENDS}.")
+    if backend == "orjson":
+        try:
+            import orjson  # noqa: F401
+        except ImportError as error:
+            raise ImportError(
+                "orjson is required for the orjson JSON backend. Install it with "
+                "pip install gmn-python-api[orjson]"
+            ) from error
+    _json_backend = backend
+
+
+def enable_query_cache(
+        max_entries: int = DEFAULT_QUERY_CACHE_MAX_ENTRIES,
+        directory: Optional[Union[str, "os.PathLike[str]"]] = None,
+        max_age: float = DEFAULT_QUERY_CACHE_MAX_AGE,
+) -> None:
+    """
+    Enable the query cache for pages of GMN REST API data, including those of get_data
+     and get_meteor_summary_data. Pages are cached by their query, with whitespace
+     outside of quoted SQL strings collapsed and the arguments sorted, and the last
+     modified date of the GMN data store. A cached page is returned until the data store
+     modifies, which is checked with a small query at most once every max_age seconds,
+     and pages of earlier versions of the data store are dropped when a newer last
+     modified date is seen. The rows
+     of cached pages are shared between calls and shouldn't be modified. Responses
+     without a last-modified header aren't cached.
+
+    :param max_entries: The maximum number of pages held in memory. The least recently
+     used pages are dropped first.
+    :param directory: Optional directory to also store pages in, gzip compressed, so
+     they're kept between processes.
+    :param max_age: The number of seconds the last modified date of the data store is
+     trusted before it's checked again.
+    :return: None.
+    """
+    global _query_cache, _query_cache_max_entries, _query_cache_max_age, \
+        _query_cache_directory
+    with _query_cache_lock:
+        _query_cache = OrderedDict()
+        _query_cache_max_entries = max_entries
+        _query_cache_max_age = max_age
+        _query_cache_directory = Path(directory).expanduser() if directory else None
+        if _query_cache_directory is not None:
+            _query_cache_directory.mkdir(parents=True, exist_ok=True)
+
+
+def disable_query_cache() -> None:
+    """
+    Disable the query cache. Pages stored on disk are kept.
+
+    :return: None.
+    """
+    global _query_cache, _query_cache_directory
+    with _query_cache_lock:
+        _query_cache = None
+        _query_cache_directory = None
+
+
+def clear_query_cache() -> None:
+    """
+    Drop all pages in the query cache, including those stored on disk, if it's enabled.
+
+    :return: None.
+    """
+    global _data_store_last_modified, _data_store_checked_at
+    with _query_cache_lock:
+        if _query_cache is not None:
+            _query_cache.clear()
+        if _query_cache_directory is not None:
+            for path in _query_cache_directory.glob("*.query.gz"):
+                path.unlink(missing_ok=True)
+        _data_store_last_modified = None
+        _data_store_checked_at = None
+
+
 def get_meteor_summary_data_all(
         where: Optional[str] = None,
         having: Optional[str] = None,
         order_by: Optional[str] = None,
         last_modified_error_retries: int = 3,
+        resumable: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     Get all meteor summary data from the Meteor Summary GMN REST API endpoint.
@@ -38,13 +181,26 @@ def get_meteor_summary_data_all(
     :param order_by: Optional parameter to specify the order of results via a SQL ORDER
      BY clause e.g. meteor.unique_trajectory_identifier DESC.
     :param last_modified_error_retries: Number of times to retry if the data has
-     modified since the last request.
+     modified since the last request. Not used if resumable is True.
+    :param resumable: If True, the data is fetched with
+     get_meteor_summary_data_resumable_iter in order of unique trajectory identifier,
+     so a data modification doesn't restart the fetch. The data is then not a snapshot
+     of a single version of the GMN Data Store, and order_by can't be given.
     :raises: LastModifiedError: If the data has modified since the last request too many
      times.
+    :raises: ValueError: If order_by is given with resumable.
     :raises: requests.exceptions.HTTPError: If the HTTP response status code is not 200
      OK.
     :return: A list of json data.
     """
+    if resumable:
+        if order_by:
+            raise ValueError("order_by can't be given with resumable.")
+        data = []
+        for data_iter, _ in get_meteor_summary_data_resumable_iter(where, having):
+            data.extend(data_iter)
+        return data
+
     try_num = 0
     while try_num <= last_modified_error_retries:
         try_num += 1
@@ -66,7 +222,9 @@ def get_meteor_summary_data_iter(
         where: Optional[str] = None,
         having: Optional[str] = None,
         order_by: Optional[str] = None,
-) -> Iterable[List[Dict[str, Any]]]:
+        prefetch: int = 0,
+        data_shape: str = "objects",
+) -> Iterable[List[Any]]:
     """
     An iterator for fetching meteor summary data from the Meteor Summary GMN REST API
      endpoint in pages. This is useful for processing large amounts of data. The data is
@@ -78,28 +236,64 @@ def get_meteor_summary_data_iter(
      participating_stations LIKE '%US0003%'.
     :param order_by: Optional parameter to specify the order of results via a SQL ORDER
      BY clause e.g. meteor.unique_trajectory_identifier DESC.
-    :raises: requests.exceptions.HTTPError: If the HTTP response status code is not 200
-     OK.
+    :param prefetch: The number of pages to fetch ahead on a background thread while the
+     previous pages are processed. If 0, each page is fetched when it's needed.
+    :param data_shape: The shape of the rows, one of DATA_SHAPES. "arrays" rows are
+     lists of values in the order of the columns of the current schema, and can be read
+     with meteor_trajectory_reader.read_data.
     :raises: LastModifiedError: If the data has modified since the last request.
     :raises: requests.exceptions.HTTPError: If the HTTP response status code is not 200
      OK.
     :return: An iterable of json data.
     """
-    data, next_url, initial_last_modified = get_meteor_summary_data(where, having, order_by)
-    yield data
+    pages = _get_meteor_summary_pages(where, having, order_by, data_shape)
+    if prefetch > 0:
+        pages = _prefetch(pages, prefetch)
+    yield from pages
 
-    while data and next_url:
-        data, next_url, last_modified = get_data_from_url(next_url)
-        if last_modified != initial_last_modified:
-            raise LastModifiedError("Data has modified since last request.")
-        yield data
+
+def get_meteor_summary_data_resumable_iter(
+        where: Optional[str] = None,
+        having: Optional[str] = None,
+        cursor: Optional[str] = None,
+        prefetch: int = 0,
+) -> Iterable[Tuple[List[Dict[str, Any]], str]]:
+    """
+    A resumable iterator for fetching meteor summary data from the Meteor Summary GMN
+     REST API endpoint in pages, in order of unique trajectory identifier. Each page is
+     yielded with a cursor, the unique trajectory identifier of its last row. Every page
+     is fetched as the first page of a query for the rows after the cursor of the
+     previous page (keyset pagination), never by page number, so:
+     - If the data modifies while iterating, the iteration carries on after the last
+       page instead of starting again. Rows added or changed before the cursor since
+       the iteration started aren't fetched.
+     - The cursor is a string that can be saved e.g. as a checkpoint, and passed as the
+       cursor parameter to resume the iteration after a crash.
+
+    :param where: Optional parameter to filter data via a SQL WHERE clause e.g.
+     iau_code = 'PER'.
+    :param having: Optional parameter to filter data via a SQL HAVING clause e.g.
+     participating_stations LIKE '%US0003%'.
+    :param cursor: Optional cursor of a page to resume the iteration after.
+    :param prefetch: The number of pages to fetch ahead on a background thread. Each
+     page depends on the cursor of the previous one, so at most the next page is
+     fetched while a page is processed.
+    :raises: requests.exceptions.HTTPError: If the HTTP response status code is not 200
+     OK.
+    :return: An iterable of tuples of json data and the cursor of the page.
+    """
+    pages = _get_keyset_pages(where, having, cursor)
+    if prefetch > 0:
+        pages = _prefetch(pages, prefetch)
+    yield from pages
 
 
 def get_meteor_summary_data(
         where: Optional[str] = None,
         having: Optional[str] = None,
         order_by: Optional[str] = None,
-) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+        data_shape: str = "objects",
+) -> Tuple[List[Any], Optional[str], Optional[str]]:
     """
     Get meteor summary data from the Meteor Summary GMN REST API endpoint starting from
      the first page.
@@ -110,6 +304,8 @@ def get_meteor_summary_data(
      participating_stations LIKE '%US0003%'.
     :param order_by: Optional parameter to specify the order of results via a SQL ORDER
      BY clause e.g. meteor.unique_trajectory_identifier DESC.
+    :param data_shape: The shape of the rows, one of DATA_SHAPES. See
+     get_meteor_summary_data_iter.
     :raises: requests.exceptions.HTTPError: If the HTTP response status code is not 200
      OK.
     :return: Tuple of json data, next URL for pagination, and the last modified date of
@@ -117,21 +313,84 @@ def get_meteor_summary_data(
      against the last_modified of the previous page. If they are different, then the
      data has modified since the last request, and the pagination is invalid.
     """
-    args = {
-        "page": 1,
-        "data_format": "json",
-        "data_shape": "objects",
-    }
+    return get_data_from_url(_get_meteor_summary_query_url(
+        where, having, order_by, data_shape=data_shape))
 
-    if where:
-        args["where"] = where
-    if having:
-        args["having"] = having
-    if order_by:
-        args["order_by"] = order_by
 
-    query_url = METEOR_SUMMARY_QUERY_URL.format(args=urlencode(args))
-    return get_data_from_url(query_url)
+def get_meteor_summary_dataframe(
+        where: Optional[str] = None,
+        having: Optional[str] = None,
+        order_by: Optional[str] = None,
+        data_format: str = "json",
+        output_camel_case: Optional[bool] = False,
+        compact_stations: Optional[bool] = False,
+        dtype_profile: str = "default",
+) -> pd.DataFrame:
+    """
+    Get all meteor summary data from the Meteor Summary GMN REST API endpoint as one
+     Pandas DataFrame, with the same columns and data types as
+     meteor_trajectory_reader.read_data. The pages are fetched in the compact "arrays"
+     data shape, without the column names in every row, or as CSV, and their values are
+     appended to a buffer per column. The DataFrame is built from the buffers once all
+     pages are fetched.
+
+    :param where: Optional parameter to filter data via a SQL WHERE clause e.g.
+     iau_code = 'PER'.
+    :param having: Optional parameter to filter data via a SQL HAVING clause e.g.
+     participating_stations LIKE '%US0003%'.
+    :param order_by: Optional parameter to specify the order of results via a SQL ORDER
+     BY clause e.g. meteor.unique_trajectory_identifier DESC.
+    :param data_format: The format to fetch the data in, one of DATA_FORMATS.
+    :param output_camel_case: If True, DataFrame column names will be camel cased e.g.
+     m_deg
+    :param compact_stations: If True, the stations column is a pandas Categorical. See
+     meteor_trajectory_reader.read_data.
+    :param dtype_profile: The data types to use, one of
+     meteor_trajectory_reader.DTYPE_PROFILES.
+    :raises: LastModifiedError: If the data has modified since the first page.
+    :raises: ValueError: If data_format isn't one of DATA_FORMATS.
+    :raises: requests.exceptions.HTTPError: If the HTTP response status code is not 200
+     OK.
+    :return: Pandas DataFrame of the meteor trajectory data.
+    """
+    if data_format not in DATA_FORMATS:
+        raise ValueError(f"Unknown data format {data_format}. Use one of {DATA_FORMATS}.")
+
+    column_names: List[str] = []
+    buffers: List[List[Any]] = []
+    for response in _get_meteor_summary_responses(
+            _get_meteor_summary_query_url(
+                where, having, order_by, data_format, data_shape="arrays")):
+        if data_format == "csv":
+            with response:
+                response.raw.decode_content = True
+                page = pd.read_csv(response.raw, keep_default_na=False, na_values=[""])
+            page_columns = list(page.columns)
+            page_values: Iterable[Any] = (page[column].tolist() for column in page)
+            page_length = len(page)
+        else:
+            data_json: Dict[str, Any] = {}
+            rows = list(_iter_response_rows(response, data_json))
+            page_columns = data_json.get("columns") or \
+                meteor_trajectory_schema.get_column_names(output_camel_case=True)
+            page_values = zip(*rows)  # noqa: B905
+            page_length = len(rows)
+
+        if not page_length:
+            break
+        if not buffers:
+            column_names = page_columns
+            buffers = [[] for _ in column_names]
+        for buffer, values in zip(buffers, page_values):  # noqa: B905
+            buffer.extend(values)
+
+    return meteor_trajectory_reader.read_data(
+        dict(zip(column_names, buffers)),  # noqa: B905
+        input_camel_case=True,
+        output_camel_case=output_camel_case,
+        compact_stations=compact_stations,
+        dtype_profile=dtype_profile,
+    )
 
 
 def get_data(sql: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
@@ -161,7 +420,8 @@ def get_data(sql: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
 def get_data_from_url(query_url: str) -> Tuple[List[Dict[str, Any]],
                                                Optional[str], Optional[str]]:
     """
-    Get data from a specified GMN REST API endpoint URL.
+    Get data from a specified GMN REST API endpoint URL. The data is served from the
+     query cache if it's enabled. See enable_query_cache.
 
     :param query_url: URL for querying data from the GMN REST API.
     :raises: requests.exceptions.HTTPError: If the HTTP response status code is not 200
@@ -171,26 +431,449 @@ def get_data_from_url(query_url: str) -> Tuple[List[Dict[str, Any]],
      against the last_modified of the previous page. If they are different, then the
      data has modified since the last request, and the pagination is invalid.
     """
-    data, next_page, gmn_data_store_last_modified = _http_get_response(query_url)
+    if _query_cache is not None:
+        return _get_cached_data_from_url(query_url)
 
-    data_json = json.loads(data)
-    if data_json.get("ok"):
-        return data_json.get("rows"), next_page, gmn_data_store_last_modified
-    else:
-        raise ValueError(data_json.get("error"))
+    rows, next_page, gmn_data_store_last_modified = iter_data_from_url(query_url)
+    return list(rows), next_page, gmn_data_store_last_modified
+
+
+def iter_data_from_url(query_url: str) -> Tuple[Iterator[Dict[str, Any]],
+                                                Optional[str], Optional[str]]:
+    """
+    Get data from a specified GMN REST API endpoint URL, decoding the rows as the
+     response is downloaded. See set_json_backend.
+
+    :param query_url: URL for querying data from the GMN REST API.
+    :raises: requests.exceptions.HTTPError: If the HTTP response status code is not 200
+     OK.
+    :return: Tuple of an iterator of the rows, next URL for pagination, and the last
+     modified date of the GMN data store. The iterator raises a ValueError with the
+     error of the response if the query failed.
+    """
+    response, next_page, gmn_data_store_last_modified = _http_get_response(query_url)
+    return _iter_response_rows(response), next_page, gmn_data_store_last_modified
+
+
+def _get_meteor_summary_pages(
+        where: Optional[str] = None,
+        having: Optional[str] = None,
+        order_by: Optional[str] = None,
+        data_shape: str = "objects",
+) -> Iterator[List[Any]]:
+    """
+    Fetch the pages of meteor summary data one after another, checking that the data
+     hasn't modified since the first page.
+
+    :param where: Optional parameter to filter data via a SQL WHERE clause.
+    :param having: Optional parameter to filter data via a SQL HAVING clause.
+    :param order_by: Optional parameter to specify the order of results via a SQL ORDER
+     BY clause.
+    :param data_shape: The shape of the rows, one of DATA_SHAPES.
+    :raises: LastModifiedError: If the data has modified since the last request.
+    :raises: requests.exceptions.HTTPError: If the HTTP response status code is not 200
+     OK.
+    :return: An iterator of json data.
+    """
+    data, next_url, initial_last_modified = get_meteor_summary_data(
+        where, having, order_by, data_shape)
+    yield data
+
+    while data and next_url:
+        data, next_url, last_modified = get_data_from_url(next_url)
+        if last_modified != initial_last_modified:
+            raise LastModifiedError("Data has modified since last request.")
+        yield data
+
+
+def _get_meteor_summary_query_url(
+        where: Optional[str] = None,
+        having: Optional[str] = None,
+        order_by: Optional[str] = None,
+        data_format: str = "json",
+        data_shape: str = "objects",
+) -> str:
+    """
+    Get the URL of the first page of a Meteor Summary GMN REST API endpoint query.
+
+    :param where: Optional parameter to filter data via a SQL WHERE clause.
+    :param having: Optional parameter to filter data via a SQL HAVING clause.
+    :param order_by: Optional parameter to specify the order of results via a SQL ORDER
+     BY clause.
+    :param data_format: The format of the data, one of DATA_FORMATS.
+    :param data_shape: The shape of JSON rows, one of DATA_SHAPES.
+    :raises: ValueError: If data_shape isn't one of DATA_SHAPES.
+    :return: The URL.
+    """
+    if data_shape not in DATA_SHAPES:
+        raise ValueError(f"Unknown data shape {data_shape}. Use one of {DATA_SHAPES}.")
+
+    args: Dict[str, Any] = {
+        "page": 1,
+        "data_format": data_format,
+        "data_shape": data_shape,
+    }
+
+    if where:
+        args["where"] = where
+    if having:
+        args["having"] = having
+    if order_by:
+        args["order_by"] = order_by
+
+    return METEOR_SUMMARY_QUERY_URL.format(args=urlencode(args))
+
+
+def _get_meteor_summary_responses(query_url: str) -> Iterator[requests.Response]:
+    """
+    Request the pages of a Meteor Summary GMN REST API endpoint query one after
+     another, checking that the data hasn't modified since the first page. Each response
+     is streamed and must be read and closed by the consumer, who stops iterating at
+     the first empty page.
+
+    :param query_url: The URL of the first page.
+    :raises: LastModifiedError: If the data has modified since the first page.
+    :raises: requests.exceptions.HTTPError: If the HTTP response status code is not 200
+     OK.
+    :return: An iterator of the responses.
+    """
+    response, next_url, initial_last_modified = _http_get_response(query_url)
+    yield response
+
+    while next_url:
+        response, next_url, last_modified = _http_get_response(next_url)
+        if last_modified != initial_last_modified:
+            response.close()
+            raise LastModifiedError("Data has modified since last request.")
+        yield response
 
 
-def _http_get_response(url: str) -> Tuple[str, Optional[str], Optional[str]]:
+def _get_keyset_pages(
+        where: Optional[str] = None,
+        having: Optional[str] = None,
+        cursor: Optional[str] = None,
+) -> Iterator[Tuple[List[Dict[str, Any]], str]]:
+    """
+    Fetch the pages of meteor summary data after a cursor one after another, each as the
+     first page of a new query filtered on the cursor of the previous page.
+
+    :param where: Optional parameter to filter data via a SQL WHERE clause.
+    :param having: Optional parameter to filter data via a SQL HAVING clause.
+    :param cursor: Optional unique trajectory identifier of the row to start after.
+    :raises: requests.exceptions.HTTPError: If the HTTP response status code is not 200
+     OK.
+    :return: An iterator of tuples of json data and the cursor of the page.
+    """
+    while True:
+        data, next_url, _ = get_meteor_summary_data(
+            _get_keyset_where(where, cursor), having, KEYSET_QUALIFIED_COLUMN)
+        if not data:
+            return
+        cursor = str(data[-1][KEYSET_COLUMN])
+        yield data, cursor
+        # The next URL isn't followed, but there are no more rows if there isn't one
+        if not next_url:
+            return
+
+
+def _get_keyset_where(where: Optional[str], cursor: Optional[str]) -> Optional[str]:
+    """
+    Add a filter for the rows after a cursor to a SQL WHERE clause.
+
+    :param where: Optional SQL WHERE clause.
+    :param cursor: Optional unique trajectory identifier of the last fetched row.
+    :return: The SQL WHERE clause.
+    """
+    if cursor is None:
+        return where
+
+    keyset_where = KEYSET_QUALIFIED_COLUMN + " > '" + cursor.replace("'", "''") + "'"
+    return f"({where}) AND {keyset_where}" if where else keyset_where
+
+
+def _get_cached_data_from_url(
+        query_url: str
+) -> Tuple[List[Any], Optional[str], Optional[str]]:
+    """
+    Get data from a specified GMN REST API endpoint URL through the query cache.
+
+    :param query_url: URL for querying data from the GMN REST API.
+    :raises: requests.exceptions.HTTPError: If the HTTP response status code is not 200
+     OK.
+    :return: Tuple of json data, next URL for pagination, and the last modified date of
+     the GMN data store.
+    """
+    key = _normalize_query_url(query_url)
+    last_modified = _get_data_store_last_modified()
+    entry = _get_query_cache_entry(key, last_modified)
+    if entry is not None:
+        return list(entry[1]), entry[2], entry[0]
+
+    rows, next_url, last_modified = iter_data_from_url(query_url)
+    data = list(rows)
+    _set_data_store_last_modified(last_modified)
+    _set_query_cache_entry(key, (last_modified, data, next_url))
+    return list(data), next_url, last_modified
+
+
+def _normalize_query_url(query_url: str) -> str:
+    """
+    Normalize a GMN REST API query URL, so the same query is cached once however it's
+     written. Runs of whitespace outside of quoted SQL strings and identifiers are
+     collapsed to a single space, and the arguments are sorted.
+
+    :param query_url: URL for querying data from the GMN REST API.
+    :return: The normalized URL.
+    """
+    url = urlsplit(query_url)
+    args = sorted(
+        (name, _SQL_TOKEN_PATTERN.sub(lambda match: match.group(1) or " ", value).strip())
+        for name, value in parse_qsl(url.query, keep_blank_values=True)
+    )
+    return f"{url.netloc}{url.path}?{urlencode(args)}"
+
+
+def _get_data_store_last_modified() -> Optional[str]:
+    """
+    Get the last modified date of the GMN data store for the query cache. It's checked
+     with a small query if it wasn't seen in the last max_age seconds. If the check has
+     no last modified date, the date seen before is kept.
+
+    :raises: requests.exceptions.HTTPError: If the HTTP response status code is not 200
+     OK.
+    :return: The last modified date of the GMN data store.
+    """
+    with _query_cache_lock:
+        if _data_store_checked_at is not None \
+                and time.monotonic() - _data_store_checked_at < _query_cache_max_age:
+            return _data_store_last_modified
+
+    response, _, last_modified = _http_get_response(QUERY_URL.format(args=urlencode({
+        "sql": DATA_STORE_CHECK_SQL,
+        "data_format": "json",
+    })))
+    response.close()
+    _set_data_store_last_modified(last_modified)
+    with _query_cache_lock:
+        return _data_store_last_modified
+
+
+def _set_data_store_last_modified(last_modified: Optional[str]) -> None:
+    """
+    Record the last modified date of the GMN data store seen in a response. If it's
+     newer than the date seen before, the pages of the query cache of other versions of
+     the data store are dropped. A response without a last modified date e.g. from a
+     proxy, or with an older date, leaves the cache as it is.
+
+    :param last_modified: The last modified date of the GMN data store.
+    :return: None.
+    """
+    global _data_store_last_modified, _data_store_checked_at
+    with _query_cache_lock:
+        if last_modified is None:
+            return
+        _data_store_checked_at = time.monotonic()
+        if not _is_newer_http_date(last_modified, _data_store_last_modified):
+            return
+        _data_store_last_modified = last_modified
+
+        if _query_cache is not None:
+            for key in [key for key, entry in _query_cache.items()
+                        if entry[0] != last_modified]:
+                del _query_cache[key]
+        if _query_cache_directory is not None:
+            suffix = f"-{_hash(last_modified)}.query.gz"
+            for path in _query_cache_directory.glob("*.query.gz"):
+                if not path.name.endswith(suffix):
+                    path.unlink(missing_ok=True)
+
+
+def _is_newer_http_date(value: str, previous_value: Optional[str]) -> bool:
+    """
+    Check if an HTTP date e.g. of a last-modified header is newer than another.
+
+    :param value: The HTTP date.
+    :param previous_value: The HTTP date to compare with, or None if there isn't one.
+    :return: True if value is newer than previous_value, or if either can't be parsed
+     and they differ.
+    """
+    if previous_value is None:
+        return True
+
+    try:
+        return _parse_http_date(value) > _parse_http_date(previous_value)
+    except (TypeError, ValueError):
+        return value != previous_value
+
+
+def _parse_http_date(value: str) -> datetime:
+    """
+    Parse an HTTP date e.g. "Fri, 04 Mar 2022 10:00:00 GMT".
+
+    :param value: The HTTP date.
+    :raises: ValueError: If the date can't be parsed.
+    :return: The date, in UTC if it has no time zone.
+    """
+    date = parsedate_to_datetime(value)
+    return date if date.tzinfo else date.replace(tzinfo=timezone.utc)
+
+
+def _get_query_cache_entry(
+        key: str, last_modified: Optional[str]
+) -> Optional[Tuple[Optional[str], List[Any], Optional[str]]]:
+    """
+    Get a page from the query cache, in memory or else on disk.
+
+    :param key: The normalized query URL.
+    :param last_modified: The current last modified date of the GMN data store.
+    :return: The last modified date, rows and next URL of the page, or None if it isn't
+     cached for the current version of the data store.
+    """
+    with _query_cache_lock:
+        if _query_cache is None or last_modified is None:
+            return None
+        entry = _query_cache.get(key)
+        if entry is not None and entry[0] == last_modified:
+            _query_cache.move_to_end(key)
+            return entry
+        if _query_cache_directory is None:
+            return None
+        path = _query_cache_directory / f"{_hash(key)}-{_hash(last_modified)}.query.gz"
+
+    try:
+        cached_json = json.loads(gzip.decompress(path.read_bytes()))
+    except (OSError, ValueError):
+        return None
+    if cached_json.get("url") != key:
+        return None
+
+    entry = (last_modified, cached_json["rows"], cached_json["next_url"])
+    _set_query_cache_entry(key, entry, write=False)
+    return entry
+
+
+def _set_query_cache_entry(
+        key: str,
+        entry: Tuple[Optional[str], List[Any], Optional[str]],
+        write: bool = True,
+) -> None:
     """
-    Perform an HTTP GET request and return the response.
+    Add a page to the query cache, dropping the least recently used pages from memory if
+     it's full.
+
+    :param key: The normalized query URL.
+    :param entry: The last modified date, rows and next URL of the page.
+    :param write: If True, the page is also stored on disk if a directory is set.
+    :return: None.
+    """
+    with _query_cache_lock:
+        # Pages without a last modified date can't be invalidated, so aren't cached
+        if _query_cache is None or entry[0] is None \
+                or entry[0] != _data_store_last_modified:
+            return
+        _query_cache[key] = entry
+        _query_cache.move_to_end(key)
+        while len(_query_cache) > _query_cache_max_entries:
+            _query_cache.popitem(last=False)
+        directory = _query_cache_directory
+
+    if write and directory is not None:
+        path = directory / f"{_hash(key)}-{_hash(entry[0])}.query.gz"
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}")
+        temp_path.write_bytes(gzip.compress(json.dumps({
+            "url": key,
+            "rows": entry[1],
+            "next_url": entry[2],
+        }).encode("utf-8")))
+        os.replace(temp_path, path)
+
+
+def _hash(value: Optional[str]) -> str:
+    """
+    Hash a value for the filename of a page of the query cache.
+
+    :param value: The value.
+    :return: The first 16 hex digits of the SHA-256 hash of the value.
+    """
+    return hashlib.sha256(str(value).encode("utf-8")).hexdigest()[:16]
+
+
+def _prefetch(pages: Iterator[Any], size: int) -> Iterator[Any]:
+    """
+    Iterate over pages on a background thread, up to size pages ahead of the consumer.
+     An exception raised while fetching is raised to the consumer after the pages
+     fetched before it. The background thread stops when the consumer stops iterating.
+
+    :param pages: The iterator of pages.
+    :param size: The maximum number of pages fetched ahead of the consumer.
+    :return: An iterator of the pages.
+    """
+    # Each entry is a page, an exception, or None once there are no more pages
+    buffer: "queue.Queue[Any]" = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+
+    threading.Thread(target=_fetch_pages, args=(pages, buffer, stopped),
+                     name="gmn-rest-api-prefetch", daemon=True).start()
+    try:
+        while True:
+            entry = buffer.get()
+            if entry is None:
+                return
+            if isinstance(entry, BaseException):
+                raise entry
+            yield entry
+    finally:
+        stopped.set()
+
+
+def _fetch_pages(
+        pages: Iterator[Any],
+        buffer: "queue.Queue[Any]",
+        stopped: threading.Event,
+) -> None:
+    """
+    Put pages in a buffer until there are no more pages, fetching them raises an
+     exception, or the consumer stops.
+
+    :param pages: The iterator of pages.
+    :param buffer: The buffer of pages, exceptions and None after the last page, which
+     is always put unless the consumer has stopped.
+    :param stopped: Set when the consumer stops iterating.
+    :return: None.
+    """
+    def put(entry: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        for page in pages:
+            if not put(page):
+                return
+    except BaseException as error:  # noqa: B036
+        # Any exception, including KeyboardInterrupt, is raised by the consumer instead
+        put(error)
+    finally:
+        # Always wake the consumer, even if the error couldn't be put in the buffer
+        put(None)
+
+
+def _http_get_response(url: str) -> Tuple[requests.Response, Optional[str],
+                                          Optional[str]]:
+    """
+    Perform a streamed HTTP GET request with the HTTP transport and return the response.
 
     :param url: URL for the HTTP GET request.
     :raises: requests.exceptions.HTTPError: If the HTTP response status code is not 200
      OK.
-    :return: Tuple containing the response text, the next URL for pagination, and the
-     last modified date of the GMN data store.
+    :return: Tuple containing the response, the next URL for pagination, and the last
+     modified date of the GMN data store. The body of the response hasn't been read.
     """
-    response = requests.get(url, timeout=200, allow_redirects=True)
+    response = get_transport().get(url, allow_redirects=True, stream=True)
 
     try:
         next_url = GMN_REST_API_DOMAIN + response.links.get("next").get(  # type: ignore
@@ -203,8 +886,177 @@ def _http_get_response(url: str) -> Tuple[str, Optional[str], Optional[str]]:
     except AttributeError:
         gmn_data_store_last_modified = None
 
-    if response.ok:
-        return str(response.text), next_url, gmn_data_store_last_modified
-    else:
+    if not response.ok:
+        response.close()
         response.raise_for_status()
-        return "", None, None
+
+    return response, next_url, gmn_data_store_last_modified
+
+
+def _iter_response_rows(
+        response: requests.Response, data_json: Optional[Dict[str, Any]] = None
+) -> Iterator[Any]:
+    """
+    Decode the rows of a GMN REST API JSON response with the JSON backend.
+
+    :param response: The streamed response.
+    :param data_json: Optional dictionary to store the other keys of the response in
+     e.g. "columns". They're stored by the time the iterator is exhausted.
+    :raises: ValueError: If the response is an error.
+    :return: An iterator of the rows.
+    """
+    with response:
+        if _json_backend == "orjson":
+            import orjson
+
+            response_json = orjson.loads(response.content)
+            if data_json is not None:
+                data_json.update(response_json)
+            if not response_json.get("ok"):
+                raise ValueError(response_json.get("error"))
+            yield from response_json.get("rows")
+            return
+
+        if response.encoding is None:
+            response.encoding = "utf-8"
+        yield from _decode_rows(
+            (chunk if isinstance(chunk, str) else chunk.decode(response.encoding)
+             for chunk in response.iter_content(
+                chunk_size=JSON_CHUNK_SIZE, decode_unicode=True)),
+            data_json)
+
+
+def _decode_rows(
+        chunks: Iterable[str], data_json: Optional[Dict[str, Any]] = None
+) -> Iterator[Any]:
+    """
+    Decode the rows of a Datasette JSON object e.g. {"ok": true, "rows": [...]} from
+     chunks of its text, yielding each row as soon as it's decoded.
+
+    :param chunks: The chunks of the JSON text.
+    :param data_json: Optional dictionary to store the other keys of the object in.
+    :raises: json.JSONDecodeError: If the text isn't valid JSON.
+    :raises: ValueError: If the object is an error.
+    :return: An iterator of the rows.
+    """
+    stream = _JsonStream(iter(chunks))
+    if data_json is None:
+        data_json = {}
+
+    stream.expect("{")
+    separator = None
+    while stream.peek() != "}":
+        if separator:
+            stream.expect(separator)
+        separator = ","
+
+        key = stream.decode()
+        stream.expect(":")
+        if key == "rows":
+            yield from _decode_array(stream)
+        else:
+            data_json[key] = stream.decode()
+    stream.expect("}")
+
+    if not data_json.get("ok"):
+        raise ValueError(data_json.get("error"))
+
+
+def _decode_array(stream: "_JsonStream") -> Iterator[Any]:
+    """
+    Decode the values of a JSON array one at a time.
+
+    :param stream: The JSON text, at the start of the array.
+    :raises: json.JSONDecodeError: If the text isn't a valid JSON array.
+    :return: An iterator of the values.
+    """
+    stream.expect("[")
+    if stream.peek() == "]":
+        stream.expect("]")
+        return
+
+    while True:
+        yield stream.decode()
+        if stream.peek() == "]":
+            stream.expect("]")
+            return
+        stream.expect(",")
+
+
+class _JsonStream:
+    """
+    A JSON text read in chunks, decoded one value at a time. Only the text that hasn't
+     been decoded yet is held in memory.
+    """
+
+    def __init__(self, chunks: Iterator[str]) -> None:
+        """
+        Create a JSON stream.
+
+        :param chunks: The chunks of the JSON text.
+        """
+        self._chunks = chunks
+        self._buffer = ""
+        self._position = 0
+        self._decoder = json.JSONDecoder()
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and get the next character without consuming it.
+
+        :return: The next character, or "" at the end of the text.
+        """
+        while True:
+            self._position = _WHITESPACE_PATTERN.match(
+                self._buffer, self._position).end()  # type: ignore[union-attr]
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._read():
+                return ""
+
+    def expect(self, character: str) -> None:
+        """
+        Consume the next character, after any whitespace.
+
+        :param character: The expected character.
+        :raises: json.JSONDecodeError: If the next character is different.
+        :return: None.
+        """
+        if self.peek() != character:
+            raise json.JSONDecodeError(
+                f"Expecting {character!r}", self._buffer, self._position)
+        self._position += 1
+
+    def decode(self) -> Any:
+        """
+        Decode the next JSON value, reading more chunks until it's complete.
+
+        :raises: json.JSONDecodeError: If the next value isn't valid JSON.
+        :return: The value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if self._read():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and self._read():
+                continue
+            self._position = end
+            return value
+
+    def _read(self) -> bool:
+        """
+        Read the next chunk into the buffer, dropping the decoded text.
+
+        :return: False if there are no more chunks.
+        """
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        return True
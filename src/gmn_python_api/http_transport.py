@@ -0,0 +1,158 @@
+"""
+This module contains the HTTP transport used by all functions that access the network.
+ The transport holds a pooled requests.Session, so connections are reused between
+ requests and modules, and retries requests that fail with a server error or are rate
+ limited.
+
+The default transport can be replaced with set_transport to tune it for a workload e.g.
+ set_transport(HttpTransport(pool_maxsize=32, retries=5)).
+"""
+import threading
+from typing import Any, Collection, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_CONNECTIONS: int = 10
+"""The default number of hosts to keep a connection pool for."""
+
+DEFAULT_POOL_MAXSIZE: int = 16
+"""The default maximum number of connections to one host."""
+
+DEFAULT_RETRIES: int = 3
+"""The default number of times to retry a request."""
+
+DEFAULT_BACKOFF_FACTOR: float = 0.5
+"""The default backoff factor between retries in seconds. The nth retry waits
+ backoff_factor * 2 ** (n - 1) seconds, or as long as the Retry-After header says."""
+
+DEFAULT_TIMEOUT: float = 200.0
+"""The default timeout of a request in seconds."""
+
+RETRY_STATUS_CODES: Collection[int] = frozenset({429, 500, 502, 503, 504})
+"""The HTTP response status codes of requests that are retried."""
+
+_transport: Optional["HttpTransport"] = None
+"""The transport used by all functions, or None if it hasn't been created yet."""
+
+_transport_lock = threading.Lock()
+"""Lock held while the default transport is created, so only one is created."""
+
+
+class HttpTransport:
+    """
+    A pooled HTTP session with connection limits, retries and timeouts.
+    """
+
+    def __init__(
+            self,
+            pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+            pool_block: bool = True,
+            retries: int = DEFAULT_RETRIES,
+            backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+            timeout: float = DEFAULT_TIMEOUT,
+            retry_status_codes: Collection[int] = RETRY_STATUS_CODES,
+    ) -> None:
+        """
+        Create a transport.
+
+        :param pool_connections: The number of hosts to keep a connection pool for.
+        :param pool_maxsize: The maximum number of connections to one host.
+        :param pool_block: If True, requests to a host with pool_maxsize connections in
+         use wait for a free connection. Otherwise, extra connections are opened and
+         closed after use.
+        :param retries: The number of times to retry a request after a connection error
+         or a response with a status code in retry_status_codes.
+        :param backoff_factor: The backoff factor between retries in seconds. See
+         DEFAULT_BACKOFF_FACTOR.
+        :param timeout: The timeout of a request in seconds, unless a request gives its
+         own.
+        :param retry_status_codes: The HTTP response status codes of requests to retry.
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=retry_status_codes,
+                # Return the last response, so its status is raised by the caller
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Perform an HTTP GET request.
+
+        :param url: URL for the HTTP GET request.
+        :param kwargs: Keyword arguments of requests.Session.get e.g. headers.
+
+        :return: The response.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def head(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Perform an HTTP HEAD request. Redirects are followed.
+
+        :param url: URL for the HTTP HEAD request.
+        :param kwargs: Keyword arguments of requests.Session.head e.g. headers.
+
+        :return: The response.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        kwargs.setdefault("allow_redirects", True)
+        return self.session.head(url, **kwargs)
+
+    def close(self) -> None:
+        """
+        Close the connections of the transport.
+
+        :return: None.
+        """
+        self.session.close()
+
+    def __enter__(self) -> "HttpTransport":
+        """Use the transport as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the connections of the transport."""
+        self.close()
+
+
+def get_transport() -> HttpTransport:
+    """
+    Get the transport used by all functions. A transport with the default settings is
+     created on first use, unless one was set with set_transport.
+
+    :return: The transport.
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HttpTransport()
+        return _transport
+
+
+def set_transport(transport: Optional[HttpTransport]) -> None:
+    """
+    Set the transport used by all functions. The previous transport isn't closed.
+
+    :param transport: The transport, or None to use a transport with the default
+     settings.
+
+    :return: None.
+    """
+    global _transport
+    with _transport_lock:
+        _transport = transport
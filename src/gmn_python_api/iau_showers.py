@@ -3,7 +3,7 @@ The module contains functions for retrieving IAU meteor shower information.
 """
 from typing import Dict
 
-import requests
+from gmn_python_api.http_transport import get_transport
 
 IAU_SHOWERS_LIST_URL = "https://www.ta3.sk/IAUC22DB/MDC2007/Etc/streamfulldata.txt"
 """The url that contains the list of IAU shower information."""
@@ -17,7 +17,7 @@ def get_iau_showers() -> Dict[str, Dict[str, str]]:
      containing the IAU shower information.
     :raises: requests.HTTPError if the source server doesn't return a 200 response.
     """
-    response = requests.get(IAU_SHOWERS_LIST_URL, timeout=200)
+    response = get_transport().get(IAU_SHOWERS_LIST_URL)
     if not response.ok:
         response.raise_for_status()
         return {}  # pragma: no cover
@@ -45,16 +45,22 @@ def get_column_names(output_camel_case: bool = False) -> List[str]:
 
 
 @lru_cache(maxsize=None)
-def get_model_meteor_trajectory_dataframe(output_camel_case: bool = False) -> pd.DataFrame:
+def get_model_meteor_trajectory_dataframe(
+        output_camel_case: bool = False,
+        dtype_profile: str = "default",
+) -> pd.DataFrame:
     """
     Get the current supported model meteor trajectory file as a DataFrame.
 
     :param output_camel_case: Whether to return the column names in camel case or verbose
+    :param dtype_profile: The data types to use, one of
+     meteor_trajectory_reader.DTYPE_PROFILES e.g. "compact".
     :return: The model meteor trajectory file as a DataFrame.
     """
     return meteor_trajectory_reader.read_data(
         _MODEL_METEOR_TRAJECTORY_FILE_PATH.read_text(),
         output_camel_case=output_camel_case,
+        dtype_profile=dtype_profile,
     )
 
 
@@ -16,7 +16,8 @@ def _mock_response(
 
     :return: The mock requests.Response object.
     """
-    mock_resp = mock.Mock()
+    mock_resp = mock.MagicMock()
+    mock_resp.__enter__.return_value = mock_resp
     mock_resp.raise_for_status = mock.Mock()
     if raise_for_status:
         mock_resp.raise_for_status.side_effect = raise_for_status
@@ -26,4 +27,5 @@ def _mock_response(
         mock_resp.ok = False
 
     mock_resp.text = text
+    mock_resp.iter_content.side_effect = lambda *args, **kwargs: iter([text])
     return mock_resp
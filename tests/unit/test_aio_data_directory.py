@@ -0,0 +1,127 @@
+"""Tests for the aio.data_directory module."""
+import asyncio
+import datetime
+import unittest
+from typing import Dict, List
+from unittest import mock
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from gmn_python_api import data_directory
+from gmn_python_api.aio import data_directory as aio_data_directory
+from gmn_python_api.meteor_trajectory_schema import _MODEL_METEOR_TRAJECTORY_FILE_PATH
+
+
+class TestAioGmnDataDirectory(unittest.IsolatedAsyncioTestCase):
+    """Tests for the aio.data_directory module."""
+
+    async def asyncSetUp(self) -> None:
+        """
+        Sets up the tests with a local HTTP server serving a mock GMN Data Directory.
+        """
+        data_directory.clear_listing_cache()
+        self.content = _MODEL_METEOR_TRAJECTORY_FILE_PATH.read_text()
+        self.listings: Dict[str, List[str]] = {
+            "daily": ["traj_summary_20181209_solrange_257.0-258.0.txt",
+                      "traj_summary_20181210_solrange_258.0-259.0.txt", "image.png"],
+            "monthly": ["traj_summary_monthly_201812.txt"],
+        }
+        self.listing_requests = 0
+
+        async def listing(request: web.Request) -> web.Response:
+            self.listing_requests += 1
+            filenames = self.listings[request.match_info["directory"]]
+            return web.Response(
+                text="<html>" + "".join('<a href="' + f + '">' + f + "</a>" for f in filenames)
+                     + "</html>",
+                content_type="text/html",
+            )
+
+        async def file(request: web.Request) -> web.Response:
+            if request.match_info["filename"] not in self.listings[
+                    request.match_info["directory"]]:
+                raise web.HTTPNotFound()
+            return web.Response(text=self.content)
+
+        app = web.Application()
+        app.router.add_get("/{directory}/", listing)
+        app.router.add_get("/{directory}/{filename}", file)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        base_url_patch = mock.patch.object(
+            data_directory, "BASE_URL", str(self.server.make_url("/")))
+        base_url_patch.start()
+        self.addCleanup(base_url_patch.stop)
+
+    async def asyncTearDown(self) -> None:
+        """
+        Stops the local HTTP server.
+        """
+        await self.server.close()
+        data_directory.clear_listing_cache()
+
+    async def test_get_all_daily_file_urls(self) -> None:
+        """
+        Test: That get_all_daily_file_urls() returns the daily file urls.
+        When: get_all_daily_file_urls() is called with a local HTTP server.
+        """
+        self.assertEqual(
+            [data_directory.BASE_URL + data_directory.DAILY_DIRECTORY + filename
+             for filename in self.listings["daily"][:2]],
+            await aio_data_directory.get_all_daily_file_urls(),
+        )
+
+    async def test_get_file_contents_concurrently(self) -> None:
+        """
+        Test: That many daily and monthly files can be fetched at once with one session,
+         fetching each directory listing once.
+        When: get_daily_file_content_by_date() and get_monthly_file_content_by_date()
+         are gathered with a shared session.
+        """
+        async with aio_data_directory.create_session(limit=4) as session:
+            contents = await asyncio.gather(*(
+                [aio_data_directory.get_daily_file_content_by_date(
+                    date_str, datetime.date(2022, 1, 1), session)
+                 for date_str in ["2018-12-09", "2018-12-10"] * 50]
+                + [aio_data_directory.get_monthly_file_content_by_date("2018-12", session)]
+            ))
+
+        self.assertEqual([self.content] * 101, contents)
+        self.assertEqual(2, self.listing_requests)
+
+    async def test_get_daily_file_url_by_date_today_and_yesterday(self) -> None:
+        """
+        Test: That get_daily_file_url_by_date() returns the latest daily file urls for
+         today and yesterday without fetching the listing.
+        When: get_daily_file_url_by_date() is called with the current date.
+        """
+        daily_url = data_directory.BASE_URL + data_directory.DAILY_DIRECTORY
+        self.assertEqual(
+            [daily_url + data_directory.SUMMARY_TODAY_FILENAME,
+             daily_url + data_directory.SUMMARY_YESTERDAY_FILENAME],
+            [await aio_data_directory.get_daily_file_url_by_date(
+                date_str, datetime.date(2019, 1, 2))
+             for date_str in ["2019-01-02", "2019-01-01"]],
+        )
+        self.assertEqual(0, self.listing_requests)
+
+    async def test_get_file_content_not_found(self) -> None:
+        """
+        Test: That FileNotFoundError is raised for a date without a file, and
+         aiohttp.ClientResponseError for a file url that doesn't return a 200 response.
+        When: get_monthly_file_content_by_date() and get_file_content_from_url() are
+         called with a local HTTP server.
+        """
+        with self.assertRaises(FileNotFoundError):
+            await aio_data_directory.get_monthly_file_content_by_date("2019-01")
+
+        with self.assertRaises(aiohttp.ClientResponseError):
+            await aio_data_directory.get_file_content_from_url(
+                data_directory.BASE_URL + data_directory.DAILY_DIRECTORY + "missing.txt")
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
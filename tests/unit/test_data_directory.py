@@ -1,15 +1,20 @@
 """Tests for the data_directory module."""
 import datetime
+import gzip
+import os
+import tempfile
 import unittest
-from typing import Callable
-from typing import List
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator
+from typing import List, Optional
 from typing import Tuple
 from unittest import mock
 
-from requests.exceptions import HTTPError
+from requests.exceptions import ChunkedEncodingError, HTTPError
 from tests.unit import _mock_response
 
 from gmn_python_api import data_directory
+from gmn_python_api import meteor_trajectory_reader
 from gmn_python_api.data_directory import DAILY_DATE_INPUT_FORMAT, \
     MONTHLY_DATE_INPUT_FORMAT
 from gmn_python_api.meteor_trajectory_schema import _MODEL_METEOR_TRAJECTORY_FILE_PATH
@@ -18,6 +23,12 @@ from gmn_python_api.meteor_trajectory_schema import _MODEL_METEOR_TRAJECTORY_FIL
 class TestGmnDataDirectory(unittest.TestCase):
     """Tests for the data_directory module."""
 
+    def setUp(self) -> None:
+        """
+        Sets up the tests.
+        """
+        data_directory.clear_listing_cache()
+
     def test_get_all_daily_file_urls_with_correct_file_extensions(self) -> None:
         """
         Test: That get_all_daily_file_urls() returns the expected list of files.
@@ -78,7 +89,7 @@ class TestGmnDataDirectory(unittest.TestCase):
             )[1],
         )
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     def test_get_all_daily_file_urls_with_bad_response(
             self, mock_get: mock.Mock
     ) -> None:
@@ -92,7 +103,7 @@ class TestGmnDataDirectory(unittest.TestCase):
         )
         self.assertRaises(HTTPError, data_directory.get_all_daily_file_urls)
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     def test_get_all_monthly_file_urls_with_bad_response(
             self, mock_get: mock.Mock
     ) -> None:
@@ -152,7 +163,7 @@ class TestGmnDataDirectory(unittest.TestCase):
             data_directory.get_all_file_url(),
         )
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     def test_get_file_content_from_url(self, mock_get: mock.Mock) -> None:
         """
         Test: That get_file_content_from_url() returns the expected file content.
@@ -211,7 +222,7 @@ class TestGmnDataDirectory(unittest.TestCase):
             )[1],
         )
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("gmn_python_api.data_directory._get_url_paths")
     def test_get_daily_file_content_by_date(
             self, mock_get_url_paths: mock.Mock, mock_get: mock.Mock
@@ -234,7 +245,7 @@ class TestGmnDataDirectory(unittest.TestCase):
                 datetime.date(2018, 12, 9).strftime(DAILY_DATE_INPUT_FORMAT)),
         )
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("gmn_python_api.data_directory._get_url_paths")
     def test_get_monthly_file_content_by_date(
             self, mock_get_url_paths: mock.Mock, mock_get: mock.Mock
@@ -257,7 +268,7 @@ class TestGmnDataDirectory(unittest.TestCase):
                 datetime.date(2018, 12, 1).strftime(MONTHLY_DATE_INPUT_FORMAT)),
         )
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     def test_get_all_file_content(self, mock_get: mock.Mock) -> None:
         """
         Test: That get_all_file_content() returns the expected file content.
@@ -270,7 +281,7 @@ class TestGmnDataDirectory(unittest.TestCase):
             data_directory.get_all_file_content(),
         )
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("gmn_python_api.data_directory._get_url_paths")
     def test_get_daily_file_content_by_date_bad_response(
             self, mock_get_url_paths: mock.Mock, mock_get: mock.Mock
@@ -295,7 +306,7 @@ class TestGmnDataDirectory(unittest.TestCase):
             datetime.date(2018, 12, 9).strftime(DAILY_DATE_INPUT_FORMAT),
         )
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("gmn_python_api.data_directory._get_url_paths")
     def test_get_daily_file_content_by_date_not_found(
             self, mock_get_url_paths: mock.Mock, _: mock.Mock
@@ -317,7 +328,7 @@ class TestGmnDataDirectory(unittest.TestCase):
             datetime.date(2018, 12, 10).strftime(DAILY_DATE_INPUT_FORMAT),
         )
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("gmn_python_api.data_directory._get_url_paths")
     def test_get_monthly_file_content_by_date_with_bad_response(
             self, mock_get_url_paths: mock.Mock, mock_get: mock.Mock
@@ -342,7 +353,7 @@ class TestGmnDataDirectory(unittest.TestCase):
             datetime.date(2018, 12, 1).strftime(MONTHLY_DATE_INPUT_FORMAT),
         )
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     @mock.patch("gmn_python_api.data_directory._get_url_paths")
     def test_get_monthly_file_content_by_date_with_not_found(
             self, mock_get_url_paths: mock.Mock, _: mock.Mock
@@ -364,7 +375,518 @@ class TestGmnDataDirectory(unittest.TestCase):
             datetime.date(2018, 11, 1).strftime(MONTHLY_DATE_INPUT_FORMAT),
         )
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
+    def test_get_all_daily_file_urls_with_streamed_listing(
+            self, mock_get: mock.Mock
+    ) -> None:
+        """
+        Test: That get_all_daily_file_urls() returns the expected list of files when
+         tags are split across the chunks of the response.
+        When: get_all_daily_file_urls() is called with an HTTP mocked response streamed
+         in chunks.
+        """
+        chunks = ['<html><a hr', 'ef="filename1.txt">a</a><a href=', '"filename2.txt"',
+                  '></a><a name="x"></a><a href="filename3.png"></a></html>']
+        mock_get.return_value = _mock_response()
+        mock_get.return_value.iter_content.side_effect = lambda *args, **kwargs: iter(
+            chunks)
+
+        self.assertEqual(
+            [data_directory.BASE_URL + data_directory.DAILY_DIRECTORY + filename
+             for filename in ["filename1.txt", "filename2.txt"]],
+            data_directory.get_all_daily_file_urls(),
+        )
+
+    @mock.patch("requests.Session.get")
+    @mock.patch("gmn_python_api.data_directory._get_hrefs_with_beautifulsoup")
+    def test_get_all_daily_file_urls_with_malformed_listing(
+            self, mock_get_hrefs_with_beautifulsoup: mock.Mock, mock_get: mock.Mock
+    ) -> None:
+        """
+        Test: That get_all_daily_file_urls() falls back to BeautifulSoup when html.parser
+         can't parse the listing.
+        When: get_all_daily_file_urls() is called with an HTTP mocked response containing
+         a marked section html.parser doesn't support.
+        """
+        listing = "<html><![foo[ x ]]><a href=filename1.txt></a></html>"
+        mock_get.return_value = _mock_response(text=listing)
+        mock_get_hrefs_with_beautifulsoup.return_value = ["filename1.txt"]
+
+        self.assertEqual(
+            [data_directory.BASE_URL + data_directory.DAILY_DIRECTORY + "filename1.txt"],
+            data_directory.get_all_daily_file_urls(),
+        )
+        mock_get_hrefs_with_beautifulsoup.assert_called_once_with(listing)
+
+    @mock.patch("gmn_python_api.data_directory._get_url_paths")
+    def test_get_daily_file_url_by_date_with_cached_listing(
+            self, mock_get_url_paths: mock.Mock
+    ) -> None:
+        """
+        Test: That the daily directory listing is fetched once for many dates, and again
+         after it expires or is cleared.
+        When: get_daily_file_url_by_date() is called for several dates.
+        """
+        daily_url = data_directory.BASE_URL + data_directory.DAILY_DIRECTORY
+        mock_get_url_paths.return_value = [
+            daily_url + "traj_summary_20181209_solrange_257.0-258.0.txt",
+            daily_url + "traj_summary_20181210_solrange_258.0-259.0.txt",
+            daily_url + data_directory.SUMMARY_YESTERDAY_FILENAME,
+        ]
+
+        self.assertEqual(
+            mock_get_url_paths.return_value[:2],
+            [data_directory.get_daily_file_url_by_date(date_str)
+             for date_str in ["2018-12-09", "2018-12-10"]],
+        )
+        self.assertRaises(FileNotFoundError, data_directory.get_daily_file_url_by_date,
+                          "2018-12-11")
+        self.assertEqual(1, mock_get_url_paths.call_count)
+
+        data_directory.clear_listing_cache()
+        data_directory.get_daily_file_url_by_date("2018-12-09")
+        with mock.patch.object(data_directory, "LISTING_CACHE_TTL", 0):
+            data_directory.get_daily_file_url_by_date("2018-12-09")
+        self.assertEqual(3, mock_get_url_paths.call_count)
+
+    @mock.patch("requests.Session.get")
+    @mock.patch("gmn_python_api.data_directory._get_url_paths")
+    def test_get_daily_file_contents_by_range(
+            self, mock_get_url_paths: mock.Mock, mock_session_get: mock.Mock
+    ) -> None:
+        """
+        Test: That get_daily_file_contents_by_range() returns the content of each daily
+         file in the range, skipping dates without a file.
+        When: get_daily_file_contents_by_range() is called with an HTTP mocked session,
+         in date order and in completion order.
+        """
+        daily_url = data_directory.BASE_URL + data_directory.DAILY_DIRECTORY
+        mock_get_url_paths.return_value = [
+            daily_url + f"traj_summary_201812{day:02d}_solrange.txt" for day in (9, 10, 12)]
+        mock_session_get.side_effect = lambda url, **kwargs: _mock_response(text=url)
+        expected_contents = [
+            ("2018-12-09", mock_get_url_paths.return_value[0]),
+            ("2018-12-10", mock_get_url_paths.return_value[1]),
+            ("2018-12-12", mock_get_url_paths.return_value[2]),
+        ]
+
+        self.assertEqual(
+            expected_contents,
+            list(data_directory.get_daily_file_contents_by_range(
+                "2018-12-08", "2018-12-12", max_workers=2)),
+        )
+        self.assertEqual(
+            expected_contents,
+            sorted(data_directory.get_daily_file_contents_by_range(
+                "2018-12-08", "2018-12-12", max_workers=2, ordered=False)),
+        )
+        self.assertEqual(6, mock_session_get.call_count)
+        self.assertEqual(1, mock_get_url_paths.call_count)
+
+    @mock.patch("requests.Session.get")
+    @mock.patch("gmn_python_api.data_directory._get_url_paths")
+    def test_get_monthly_file_contents_by_range(
+            self, mock_get_url_paths: mock.Mock, mock_session_get: mock.Mock
+    ) -> None:
+        """
+        Test: That get_monthly_file_contents_by_range() returns the content of each
+         monthly file in the range across a year boundary, and raises an exception when
+         an HTTP response is bad.
+        When: get_monthly_file_contents_by_range() is called with an HTTP mocked session.
+        """
+        monthly_url = data_directory.BASE_URL + data_directory.MONTHLY_DIRECTORY
+        mock_get_url_paths.return_value = [
+            monthly_url + f"traj_summary_monthly_{month}.txt"
+            for month in ("201811", "201812", "201901", "201902")]
+        mock_session_get.side_effect = lambda url, **kwargs: _mock_response(text=url)
+
+        self.assertEqual(
+            [("2018-12", mock_get_url_paths.return_value[1]),
+             ("2019-01", mock_get_url_paths.return_value[2])],
+            list(data_directory.get_monthly_file_contents_by_range("2018-12", "2019-01")),
+        )
+
+        mock_session_get.side_effect = None
+        mock_session_get.return_value = _mock_response(
+            status=500, raise_for_status=HTTPError("Bad response"))
+        self.assertRaises(HTTPError, list,
+                          data_directory.get_monthly_file_contents_by_range(
+                              "2018-12", "2019-01"))
+
+    @mock.patch("requests.Session.get")
+    @mock.patch("requests.Session.head")
+    @mock.patch("gmn_python_api.data_directory._get_url_paths")
+    def test_get_file_contents_by_range(
+            self,
+            mock_get_url_paths: mock.Mock,
+            mock_session_head: mock.Mock,
+            mock_session_get: mock.Mock,
+    ) -> None:
+        """
+        Test: That plan_range() chooses a monthly file when it's smaller than the daily
+         files of the range in its month or when there are no daily files in its
+         month, and daily files otherwise or when the range includes today or
+         yesterday, and that get_file_contents_by_range() returns the
+         content of the planned files.
+        When: plan_range() and get_file_contents_by_range() are called with HTTP mocked
+         HEAD and GET responses.
+        """
+        daily_url = data_directory.BASE_URL + data_directory.DAILY_DIRECTORY
+        monthly_url = data_directory.BASE_URL + data_directory.MONTHLY_DIRECTORY
+        listings = {
+            daily_url: [daily_url + f"traj_summary_{month}{day:02d}_solrange.txt"
+                        for month in ["201812", "201901"] for day in range(1, 32)],
+            monthly_url: [monthly_url + f"traj_summary_monthly_{month}.txt"
+                          for month in ["201811", "201812", "201901"]],
+        }
+        sizes = {monthly_url + "traj_summary_monthly_201812.txt": 100,
+                 monthly_url + "traj_summary_monthly_201901.txt": 300}
+        mock_get_url_paths.side_effect = lambda url, ext: listings[url]
+
+        def head(url: str, **kwargs: Any) -> mock.Mock:
+            response = _mock_response()
+            response.headers = {"Content-Length": str(sizes.get(url, 10))}
+            return response
+
+        mock_session_head.side_effect = head
+        mock_session_get.side_effect = lambda url, **kwargs: _mock_response(text=url)
+        expected_plan = [
+            ("2018-12", monthly_url + "traj_summary_monthly_201812.txt"),
+            ("2019-01-01", daily_url + "traj_summary_20190101_solrange.txt"),
+            ("2019-01-02", daily_url + "traj_summary_20190102_solrange.txt"),
+        ]
+
+        self.assertEqual(expected_plan, data_directory.plan_range(
+            "2018-12-09", "2019-01-02", current_date=datetime.date(2022, 1, 1)))
+        self.assertEqual(expected_plan, list(data_directory.get_file_contents_by_range(
+            "2018-12-09", "2019-01-02", max_workers=2,
+            current_date=datetime.date(2022, 1, 1))))
+
+        plan = data_directory.plan_range(
+            "2018-12-09", "2018-12-31", current_date=datetime.date(2019, 1, 1))
+        self.assertEqual(23, len(plan))
+        self.assertEqual(
+            ("2018-12-31", daily_url + data_directory.SUMMARY_YESTERDAY_FILENAME),
+            plan[-1])
+
+        self.assertEqual(
+            [("2018-11", monthly_url + "traj_summary_monthly_201811.txt")],
+            data_directory.plan_range(
+                "2018-11-01", "2018-11-30", current_date=datetime.date(2022, 1, 1)))
+
+    @mock.patch.object(data_directory, "DOWNLOAD_CHUNK_SIZE", 10000)
+    def test_download_all_file_resumes_after_dropped_connection(self) -> None:
+        """
+        Test: That download_all_file() resumes the download with a Range request after
+         the connection drops, and that the file can be read by read_data.
+        When: download_all_file() is called with an HTTP mocked response that drops the
+         connection twice.
+        """
+        content = _MODEL_METEOR_TRAJECTORY_FILE_PATH.read_bytes()
+        mock_get = self._mock_file_server(content, drop_after_chunks=[2, 3])
+
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch("requests.Session.get", mock_get):
+            path = data_directory.download_all_file(Path(directory, "all.txt"))
+
+            self.assertEqual(content, path.read_bytes())
+            self.assertEqual([], list(Path(directory).glob("*.part")))
+            self.assertEqual(
+                (534, 85), meteor_trajectory_reader.read_data(path).shape)
+
+        self.assertEqual(data_directory.get_all_file_url(), mock_get.call_args[0][0])
+        self.assertEqual(
+            [None, "bytes=20000-", "bytes=50000-"],
+            [call[1]["headers"].get("Range") for call in mock_get.call_args_list],
+        )
+
+        mock_get = self._mock_file_server(content, drop_after_chunks=[1, 1])
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch("requests.Session.get", mock_get):
+            self.assertRaises(ChunkedEncodingError, data_directory.download_all_file,
+                              Path(directory, "all.txt"), retries=1)
+
+            # A later call resumes from the partly downloaded file
+            mock_get.side_effect = self._mock_file_server(content).side_effect
+            path = data_directory.download_all_file(Path(directory, "all.txt"))
+            self.assertEqual(content, path.read_bytes())
+            self.assertEqual("bytes=20000-",
+                             mock_get.call_args_list[-1][1]["headers"]["Range"])
+
+    def test_download_file_changed_between_attempts(self) -> None:
+        """
+        Test: That download_file() downloads the whole file again instead of resuming
+         when the file changed since the download started, whether the server supports
+         If-Range or not, and removes the validator file afterwards.
+        When: download_file() is called after a dropped download with an HTTP mocked
+         response of a changed file.
+        """
+        old_content, new_content = b"x" * 100, b"z" * 120
+        file_url = data_directory.BASE_URL + "file.txt"
+        for if_range_support in [True, False]:
+            with tempfile.TemporaryDirectory() as directory:
+                path = Path(directory, "file.txt")
+                with mock.patch.object(data_directory, "DOWNLOAD_CHUNK_SIZE", 10), \
+                        mock.patch("requests.Session.get", self._mock_file_server(
+                            old_content, drop_after_chunks=[3])):
+                    self.assertRaises(ChunkedEncodingError, data_directory.download_file,
+                                      file_url, path, retries=0)
+                self.assertEqual(b"x" * 30, Path(directory, "file.txt.part").read_bytes())
+                self.assertEqual(
+                    '"1"', Path(directory, "file.txt.part.validator").read_text())
+
+                mock_get = self._mock_file_server(
+                    new_content, etag='"2"', if_range_support=if_range_support)
+                with mock.patch("requests.Session.get", mock_get):
+                    self.assertEqual(new_content, data_directory.download_file(
+                        file_url, path).read_bytes())
+
+                self.assertEqual(
+                    {"Accept-Encoding": "identity", "Range": "bytes=30-",
+                     "If-Range": '"1"'},
+                    mock_get.call_args_list[0][1]["headers"])
+                self.assertEqual(["file.txt"], os.listdir(directory))
+
+    def test_download_file_without_range_support(self) -> None:
+        """
+        Test: That download_file() downloads the whole file again when the server ignores
+         the Range header, deletes a partial file larger than the file, and compresses
+         the file when the path ends with .gz.
+        When: download_file() is called with a partial file and an HTTP mocked response
+         without range support.
+        """
+        content = b"x" * 100
+        file_url = data_directory.BASE_URL + "file.txt"
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "file.txt")
+            Path(directory, "file.txt.part").write_bytes(b"y" * 10)
+            with mock.patch("requests.Session.get",
+                            self._mock_file_server(content, range_support=False)):
+                self.assertEqual(content, data_directory.download_file(
+                    file_url, path).read_bytes())
+
+            Path(directory, "file.txt.part").write_bytes(b"y" * 200)
+            with mock.patch("requests.Session.get", self._mock_file_server(content)):
+                self.assertEqual(content, data_directory.download_file(
+                    file_url, path).read_bytes())
+
+            with mock.patch("requests.Session.get", self._mock_file_server(content)):
+                compressed_path = data_directory.download_file(
+                    file_url, Path(directory, "file.txt.gz"))
+            self.assertEqual(content, gzip.decompress(compressed_path.read_bytes()))
+            self.assertEqual(["file.txt", "file.txt.gz"], sorted(os.listdir(directory)))
+
+    def test_download_file_larger_than_expected(self) -> None:
+        """
+        Test: That download_file() raises an OSError when more bytes are downloaded than
+         the size given by the server.
+        When: download_file() is called with an HTTP mocked response with a wrong
+         Content-Length header.
+        """
+        mock_get = self._mock_file_server(b"x" * 100)
+        mock_get.return_value.headers["Content-Length"] = "50"
+        mock_get.side_effect = None
+
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch("requests.Session.get", mock_get):
+            self.assertRaises(OSError, data_directory.download_file,
+                              data_directory.BASE_URL + "file.txt",
+                              Path(directory, "file.txt"))
+            self.assertEqual([], os.listdir(directory))
+
+    def test_mirror(self) -> None:
+        """
+        Test: That mirror() downloads new files on the first run, only downloads changed
+         files on the next run, skips files before since, and records a manifest that
+         get_mirrored_file_paths() reads without using the network.
+        When: mirror() is called twice with HTTP mocked HEAD and GET responses.
+        """
+        content = b"x" * 100
+        daily_url = data_directory.BASE_URL + data_directory.DAILY_DIRECTORY
+        monthly_url = data_directory.BASE_URL + data_directory.MONTHLY_DIRECTORY
+        daily_filenames = [f"traj_summary_201812{day:02d}_solrange_257.0-258.0.txt"
+                           for day in [8, 9, 10]]
+        monthly_filenames = ["traj_summary_monthly_201811.txt",
+                             "traj_summary_monthly_201812.txt"]
+        listings = {daily_url: [daily_url + filename for filename in daily_filenames],
+                    monthly_url: [monthly_url + filename
+                                  for filename in monthly_filenames]}
+        last_modified = {url: "Fri, 04 Mar 2022 00:00:00 GMT"
+                         for urls in listings.values() for url in urls}
+
+        def head(url: str, **kwargs: Any) -> mock.Mock:
+            response = _mock_response()
+            response.headers = {"Content-Length": str(len(content)),
+                                "Last-Modified": last_modified[url]}
+            return response
+
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(data_directory, "_get_url_paths",
+                                  side_effect=lambda url, ext: listings[url]), \
+                mock.patch("requests.Session.head", side_effect=head), \
+                mock.patch("requests.Session.get",
+                           self._mock_file_server(content)) as mock_get:
+            manifest = data_directory.mirror(directory, since="2018-12-09")
+            self.assertEqual(3, mock_get.call_count)
+
+            last_modified[daily_url + daily_filenames[1]] = \
+                "Sat, 05 Mar 2022 00:00:00 GMT"
+            self.assertEqual(manifest, data_directory.read_manifest(directory))
+            manifest = data_directory.mirror(directory, since="2018-12-09")
+            self.assertEqual(4, mock_get.call_count)
+            self.assertEqual(daily_url + daily_filenames[1], mock_get.call_args[0][0])
+
+            self.assertEqual(
+                ["2018-12-09", "2018-12-10", "2018-12"],
+                [entry["date"] for entry in manifest.values()],
+            )
+            self.assertEqual(
+                "Sat, 05 Mar 2022 00:00:00 GMT",
+                manifest[data_directory.DAILY_DIRECTORY + daily_filenames[1]][
+                    "last_modified"],
+            )
+            self.assertEqual(
+                [Path(directory, data_directory.DAILY_DIRECTORY, daily_filenames[2])],
+                data_directory.get_mirrored_file_paths(directory,
+                                                       start_date_str="2018-12-10"),
+            )
+            self.assertEqual(
+                [Path(directory, data_directory.MONTHLY_DIRECTORY, monthly_filenames[1])],
+                data_directory.get_mirrored_file_paths(
+                    directory, data_directory.MONTHLY_DIRECTORY),
+            )
+            self.assertTrue(all(
+                path.read_bytes() == content
+                for path in data_directory.get_mirrored_file_paths(directory)))
+
+    @mock.patch("requests.Session.get")
+    def test_get_file_content_from_url_with_cache(self, mock_get: mock.Mock) -> None:
+        """
+        Test: That get_file_content_from_url() revalidates a cached file and returns its
+         content when the server responds 304 Not Modified.
+        When: get_file_content_from_url() is called twice with the cache enabled.
+        """
+        file_url = data_directory.BASE_URL + data_directory.MONTHLY_DIRECTORY + "a.txt"
+        expected_content = open(_MODEL_METEOR_TRAJECTORY_FILE_PATH).read()
+        full_response = _mock_response(text=expected_content)
+        full_response.headers = {"ETag": '"abc"', "Last-Modified": "Fri, 04 Mar 2022"}
+        not_modified_response = _mock_response(status=304, text="")
+        not_modified_response.headers = {}
+        mock_get.side_effect = [full_response, not_modified_response]
+
+        with tempfile.TemporaryDirectory() as cache_directory:
+            data_directory.enable_cache(cache_directory)
+            try:
+                self.assertEqual(expected_content,
+                                 data_directory.get_file_content_from_url(file_url))
+                self.assertEqual(expected_content,
+                                 data_directory.get_file_content_from_url(file_url))
+            finally:
+                data_directory.disable_cache()
+
+        self.assertEqual({}, mock_get.call_args_list[0][1]["headers"])
+        self.assertEqual(
+            {"If-None-Match": '"abc"', "If-Modified-Since": "Fri, 04 Mar 2022"},
+            mock_get.call_args_list[1][1]["headers"],
+        )
+
+    @mock.patch("requests.Session.get")
+    def test_get_file_content_from_url_with_cache_eviction(
+            self, mock_get: mock.Mock
+    ) -> None:
+        """
+        Test: That the least recently used files are evicted from the cache when it
+         grows past its maximum size, and that responses without an ETag or
+         Last-Modified header aren't cached.
+        When: get_file_content_from_url() is called for three files with the cache
+         enabled and a maximum size of two files.
+        """
+        responses = []
+        for text in ["a" * 100, "b" * 100, "c" * 100, "d" * 100]:
+            response = _mock_response(text=text)
+            response.headers = {"ETag": text[0]} if text != "d" * 100 else {}
+            responses.append(response)
+        mock_get.side_effect = responses
+
+        with tempfile.TemporaryDirectory() as cache_directory:
+            data_directory.enable_cache(cache_directory, max_size=2 * len(gzip.compress(
+                b"a" * 100, compresslevel=data_directory.GZIP_COMPRESSLEVEL)))
+            try:
+                for filename in ["a.txt", "b.txt", "c.txt", "d.txt"]:
+                    data_directory.get_file_content_from_url(
+                        data_directory.BASE_URL + filename)
+                    # Make the modification times of the cached files distinct
+                    for index, path in enumerate(sorted(
+                            os.scandir(cache_directory), key=lambda e: e.stat().st_mtime)):
+                        os.utime(path, (index, index))
+
+                cached_contents = sorted(
+                    gzip.decompress(open(entry.path, "rb").read()).decode()
+                    for entry in os.scandir(cache_directory)
+                    if entry.name.endswith(".cache"))
+                data_directory.clear_cache()
+                self.assertEqual([], os.listdir(cache_directory))
+            finally:
+                data_directory.disable_cache()
+
+        self.assertEqual(["b" * 100, "c" * 100], cached_contents)
+
+    @staticmethod
+    def _mock_file_server(
+            content: bytes,
+            drop_after_chunks: Optional[List[int]] = None,
+            range_support: bool = True,
+            etag: str = '"1"',
+            if_range_support: bool = True,
+    ) -> mock.Mock:
+        """
+        Mock requests.Session.get for a server of a file that supports Range requests.
+
+        :param content: The content of the file.
+        :param drop_after_chunks: The number of chunks each response streams before the
+         connection drops, for the first responses.
+        :param range_support: Whether the server supports Range requests.
+        :param etag: The ETag of the file.
+        :param if_range_support: Whether the server supports If-Range headers.
+
+        :return: The requests.Session.get mock object.
+        """
+        drops: List[int] = []
+
+        def get(url: str, headers: Dict[str, str], **kwargs: Any) -> mock.Mock:
+            start = int(headers["Range"][len("bytes="):-1]) \
+                if "Range" in headers and range_support else 0
+            if if_range_support and headers.get("If-Range", etag) != etag:
+                start = 0
+            response = _mock_response(status=206 if start else 200)
+            response.ok = True
+            response.headers = {"Content-Length": str(len(content) - start),
+                                "ETag": etag}
+            if start >= len(content):
+                response.status_code = 416
+                response.headers = {"Content-Range": f"bytes */{len(content)}",
+                                    "ETag": etag}
+            elif start:
+                response.headers["Content-Range"] = \
+                    f"bytes {start}-{len(content) - 1}/{len(content)}"
+            drop_after = drops.pop(0) if drops else None
+
+            def iter_content(chunk_size: int, **_: Any) -> Iterator[bytes]:
+                for chunk_number, chunk_start in enumerate(
+                        range(start, len(content), chunk_size)):
+                    if chunk_number == drop_after:
+                        raise ChunkedEncodingError("Connection broken")
+                    yield content[chunk_start:chunk_start + chunk_size]
+
+            response.iter_content.side_effect = iter_content
+            return response
+
+        mock_get = mock.Mock(side_effect=get)
+        mock_get.return_value = get("", {})
+        drops.extend(drop_after_chunks or [])
+        return mock_get
+
+    @mock.patch("requests.Session.get")
     def _run_get_all_method_with_mock_directory_listing(
             self,
             func: Callable[..., List[str]],
@@ -380,7 +902,7 @@ class TestGmnDataDirectory(unittest.TestCase):
         :param filenames: The expected filenames to be returned by the mock directory
          listing.
         :param directory: The directory to be mocked (e.g. daily/ or monthly/).
-        :param mock_get: The requests.get mock object. Ignore and leave blank for
+        :param mock_get: The requests.Session.get mock object. Ignore and leave blank for
          method calls.
 
         :return: The expected file urls and the actual filenames returned by the mocked
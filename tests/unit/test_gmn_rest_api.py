@@ -0,0 +1,380 @@
+"""Tests for the gmn_rest_api module."""
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd  # type: ignore
+from tests.unit import _mock_response
+
+from gmn_python_api import gmn_rest_api
+from gmn_python_api import meteor_trajectory_reader
+
+
+class TestGmnRestApi(unittest.TestCase):
+    """Tests for the gmn_rest_api module."""
+
+    def setUp(self) -> None:
+        """
+        Sets up the tests with mocked pages of meteor summary data.
+        """
+        self.pages = [[{"id": page * 2}, {"id": page * 2 + 1}] for page in range(5)]
+        self.last_modified = ["Fri, 04 Mar 2022"] * len(self.pages)
+        self.fetched = threading.Semaphore(0)
+
+        def get_data_from_url(
+                query_url: str
+        ) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+            page = int(query_url.rpartition("page=")[2].partition("&")[0]) - 1
+            self.fetched.release()
+            next_url = f"next?page={page + 2}" if page + 1 < len(self.pages) else None
+            return self.pages[page], next_url, self.last_modified[page]
+
+        get_data_from_url_patch = mock.patch.object(
+            gmn_rest_api, "get_data_from_url", side_effect=get_data_from_url)
+        self.mock_get_data_from_url = get_data_from_url_patch.start()
+        self.addCleanup(get_data_from_url_patch.stop)
+
+    def test_get_meteor_summary_data_iter(self) -> None:
+        """
+        Test: That get_meteor_summary_data_iter() yields every page in order, with and
+         without prefetching.
+        When: get_meteor_summary_data_iter() is called with mocked pages.
+        """
+        self.assertEqual(self.pages, list(gmn_rest_api.get_meteor_summary_data_iter()))
+        self.assertEqual(
+            self.pages, list(gmn_rest_api.get_meteor_summary_data_iter(prefetch=2)))
+        self.assertEqual(2 * len(self.pages), self.mock_get_data_from_url.call_count)
+
+    def test_get_meteor_summary_data_iter_prefetches_pages(self) -> None:
+        """
+        Test: That get_meteor_summary_data_iter() fetches pages ahead of the consumer up
+         to the prefetch limit, and stops fetching when the consumer stops.
+        When: get_meteor_summary_data_iter() is called with prefetch=2 and only the first
+         page is consumed.
+        """
+        pages = iter(gmn_rest_api.get_meteor_summary_data_iter(prefetch=2))
+        self.assertEqual(self.pages[0], next(pages))
+
+        # The first page, two pages in the buffer, and one waiting for space
+        for _ in range(4):
+            self.assertTrue(self.fetched.acquire(timeout=5))
+        self.assertFalse(self.fetched.acquire(timeout=0.5))
+
+        pages.close()  # type: ignore
+        self.assertFalse(self.fetched.acquire(timeout=0.5))
+        self.assertEqual(4, self.mock_get_data_from_url.call_count)
+
+    def test_get_meteor_summary_data_iter_last_modified(self) -> None:
+        """
+        Test: That get_meteor_summary_data_iter() raises a LastModifiedError after the
+         pages fetched before the data modified, with and without prefetching.
+        When: get_meteor_summary_data_iter() is called with mocked pages where the
+         data modifies before the third page.
+        """
+        self.last_modified[2:] = ["Sat, 05 Mar 2022"] * 3
+
+        for prefetch in [0, 2]:
+            pages = []
+            with self.assertRaises(gmn_rest_api.LastModifiedError):
+                for page in gmn_rest_api.get_meteor_summary_data_iter(prefetch=prefetch):
+                    pages.append(page)
+            self.assertEqual(self.pages[:2], pages)
+
+    def test_get_meteor_summary_data_all(self) -> None:
+        """
+        Test: That get_meteor_summary_data_all() follows the pages in server order by
+         default, and raises a LastModifiedError when the data modifies on every try.
+        When: get_meteor_summary_data_all() is called with mocked pages, then with
+         mocked pages where the data modifies before the third page.
+        """
+        self.assertEqual([row for page in self.pages for row in page],
+                         gmn_rest_api.get_meteor_summary_data_all())
+        self.assertEqual(len(self.pages), self.mock_get_data_from_url.call_count)
+
+        self.last_modified[2:] = ["Sat, 05 Mar 2022"] * 3
+        self.mock_get_data_from_url.reset_mock()
+        self.assertRaises(gmn_rest_api.LastModifiedError,
+                          gmn_rest_api.get_meteor_summary_data_all,
+                          last_modified_error_retries=1)
+        self.assertEqual(2 * 3, self.mock_get_data_from_url.call_count)
+
+    def test_get_meteor_summary_data_iter_prefetch_base_exception(self) -> None:
+        """
+        Test: That get_meteor_summary_data_iter() raises an exception that isn't an
+         Exception subclass on the prefetch thread to the consumer instead of blocking.
+        When: get_meteor_summary_data_iter() is called with prefetch=2 and fetching the
+         second page raises a SystemExit.
+        """
+        def get_pages(*args: Any) -> Iterator[List[Dict[str, Any]]]:
+            yield self.pages[0]
+            raise SystemExit()
+
+        pages = []
+        with mock.patch.object(gmn_rest_api, "_get_meteor_summary_pages",
+                               side_effect=get_pages), self.assertRaises(SystemExit):
+            for page in gmn_rest_api.get_meteor_summary_data_iter(prefetch=2):
+                pages.append(page)
+        self.assertEqual(self.pages[:1], pages)
+
+    def test_get_meteor_summary_data_resumable_iter(self) -> None:
+        """
+        Test: That get_meteor_summary_data_resumable_iter() fetches every page as the
+         first page of a query filtered on the cursor of the previous page, without
+         following page numbers, resumes from a given cursor, and that
+         get_meteor_summary_data_all() uses it when resumable is given.
+        When: get_meteor_summary_data_resumable_iter() is called with mocked pages of two
+         rows that have next links.
+        """
+        rows = [{"unique_trajectory_identifier": f"2019010100000{i}_abcde"}
+                for i in range(7)]
+
+        def get_data_from_url(
+                query_url: str
+        ) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+            where = parse_qs(urlsplit(query_url).query).get("where", [""])[0]
+            cursor = where.partition("> '")[2].rstrip("'")
+            remaining_rows = [row for row in rows
+                              if row["unique_trajectory_identifier"] > cursor]
+            next_url = "next?page=2" if len(remaining_rows) > 2 else None
+            return remaining_rows[:2], next_url, self.last_modified[0]
+
+        self.mock_get_data_from_url.side_effect = get_data_from_url
+        for prefetch in [0, 2]:
+            self.mock_get_data_from_url.reset_mock()
+            pages = list(gmn_rest_api.get_meteor_summary_data_resumable_iter(
+                "iau_code = 'PER'", prefetch=prefetch))
+
+            self.assertEqual([rows[0:2], rows[2:4], rows[4:6], rows[6:7]],
+                             [page for page, _ in pages])
+            self.assertEqual(rows[6]["unique_trajectory_identifier"], pages[-1][1])
+            query_args = [parse_qs(urlsplit(call[0][0]).query)
+                          for call in self.mock_get_data_from_url.call_args_list]
+            self.assertEqual([["1"]] * 4, [args["page"] for args in query_args])
+            self.assertEqual([["meteor.unique_trajectory_identifier"]] * 4,
+                             [args["order_by"] for args in query_args])
+            self.assertEqual(
+                ["iau_code = 'PER'",
+                 "(iau_code = 'PER') AND meteor.unique_trajectory_identifier > "
+                 "'20190101000001_abcde'"],
+                [args["where"][0] for args in query_args[:2]])
+
+        self.assertEqual(rows[5:], [row for page, _ in (
+            gmn_rest_api.get_meteor_summary_data_resumable_iter(
+                cursor=rows[4]["unique_trajectory_identifier"])) for row in page])
+        self.assertEqual(rows, gmn_rest_api.get_meteor_summary_data_all(resumable=True))
+        self.assertRaises(ValueError, gmn_rest_api.get_meteor_summary_data_all,
+                          order_by="meteor.unique_trajectory_identifier",
+                          resumable=True)
+
+    def test_iter_data_from_url(self) -> None:
+        """
+        Test: That iter_data_from_url() decodes the rows of a response read in chunks of
+         any size with each JSON backend, and raises a ValueError for an error response.
+        When: iter_data_from_url() is called with HTTP mocked responses.
+        """
+        rows = [{"id": i, "name": f"row \\\" {i}", "values": [1.5e-3 * i, None]}
+                for i in range(20)]
+        text = json.dumps({"ok": True, "rows": rows, "truncated": False, "count": 20},
+                          indent=1)
+        url = gmn_rest_api.QUERY_URL.format(args="sql=select")
+
+        for backend in gmn_rest_api.JSON_BACKENDS:
+            gmn_rest_api.set_json_backend(backend)
+            self.addCleanup(gmn_rest_api.set_json_backend, "json")
+            for chunk_size in [1, 7, len(text)]:
+                response = _mock_response(text=text)
+                response.content = text.encode()
+                response.encoding = None
+                response.iter_content.side_effect = lambda size=chunk_size, **kwargs: (
+                    text[i:i + size].encode() for i in range(0, len(text), size))
+                response.headers = {"last-modified": "1"}
+                response.links = {}
+                with mock.patch("requests.Session.get", return_value=response):
+                    data, next_url, last_modified = gmn_rest_api.iter_data_from_url(url)
+                    self.assertEqual((rows, None, "1"),
+                                     (list(data), next_url, last_modified))
+
+            response = _mock_response(text='{"ok": false, "error": "Bad SQL"}')
+            response.content = response.text.encode()
+            with mock.patch("requests.Session.get", return_value=response), \
+                    self.assertRaisesRegex(ValueError, "Bad SQL"):
+                list(gmn_rest_api.iter_data_from_url(url)[0])
+
+        self.assertRaises(ValueError, gmn_rest_api.set_json_backend, "yaml")
+
+    def test_get_meteor_summary_dataframe(self) -> None:
+        """
+        Test: That get_meteor_summary_dataframe() builds the same DataFrame from pages of
+         JSON arrays and of CSV as read_data() does from all the rows.
+        When: get_meteor_summary_dataframe() is called with HTTP mocked pages of the
+         REST API test data.
+        """
+        rest_api_dataframe = pd.read_csv(os.path.join(
+            os.path.dirname(__file__), "test_data", "rest_api_meteor_summary.txt"))
+        arrays = json.loads(rest_api_dataframe.to_json(orient="values"))
+        expected_dataframe = meteor_trajectory_reader.read_data(
+            arrays, input_camel_case=True)
+
+        for data_format in gmn_rest_api.DATA_FORMATS:
+            responses: List[mock.Mock] = []
+            for start in range(0, len(arrays) + 40, 40):
+                if data_format == "csv":
+                    response = _mock_response()
+                    response.raw = io.BytesIO(rest_api_dataframe[start:start + 40].to_csv(
+                        index=False).encode())
+                else:
+                    response = _mock_response(text=json.dumps({
+                        "ok": True,
+                        "rows": arrays[start:start + 40],
+                        "columns": rest_api_dataframe.columns.tolist(),
+                    }))
+                    response.encoding = "utf-8"
+                response.headers = {"last-modified": "Fri, 04 Mar 2022"}
+                response.links = {"next": {"url": f"/meteor_summary?page={len(responses) + 2}"}}
+                responses.append(response)
+
+            with mock.patch("requests.Session.get", side_effect=responses) as mock_get:
+                pd.testing.assert_frame_equal(
+                    expected_dataframe,
+                    gmn_rest_api.get_meteor_summary_dataframe(data_format=data_format))
+            self.assertIn(f"data_format={data_format}&data_shape=arrays",
+                          mock_get.call_args_list[0][0][0])
+            self.assertEqual(4, mock_get.call_count)
+
+        self.assertRaises(ValueError, gmn_rest_api.get_meteor_summary_dataframe,
+                          data_format="xml")
+
+    def test_get_meteor_summary_dataframe_csv_without_next_link(self) -> None:
+        """
+        Test: That get_meteor_summary_dataframe() stops after a CSV page without a next
+         link.
+        When: get_meteor_summary_dataframe() is called with data_format="csv" and an
+         HTTP mocked response with all the rows and no Link header.
+        """
+        rest_api_dataframe = pd.read_csv(os.path.join(
+            os.path.dirname(__file__), "test_data", "rest_api_meteor_summary.txt"))
+        response = _mock_response()
+        response.raw = io.BytesIO(rest_api_dataframe.to_csv(index=False).encode())
+        response.headers = {"last-modified": "Fri, 04 Mar 2022"}
+        response.links = {}
+
+        with mock.patch("requests.Session.get", return_value=response) as mock_get:
+            actual_dataframe = gmn_rest_api.get_meteor_summary_dataframe(
+                data_format="csv")
+
+        pd.testing.assert_frame_equal(
+            meteor_trajectory_reader.read_data(
+                rest_api_dataframe.to_dict(orient="list"), input_camel_case=True),
+            actual_dataframe)
+        mock_get.assert_called_once()
+
+
+class TestGmnRestApiQueryCache(unittest.TestCase):
+    """Tests for the query cache of the gmn_rest_api module."""
+
+    def setUp(self) -> None:
+        """
+        Sets up the tests with a query cache on disk and mocked responses of a GMN data
+         store with the last modified date in self.last_modified.
+        """
+        self.directory = Path(tempfile.mkdtemp())
+        self.last_modified: Optional[str] = "Fri, 04 Mar 2022 10:00:00 GMT"
+        gmn_rest_api.enable_query_cache(max_entries=2, directory=self.directory,
+                                        max_age=3600)
+        self.addCleanup(gmn_rest_api.disable_query_cache)
+        self.addCleanup(gmn_rest_api.clear_query_cache)
+
+        def iter_data_from_url(
+                query_url: str
+        ) -> Tuple[Iterator[Dict[str, Any]], Optional[str], Optional[str]]:
+            return iter([{"url": query_url}]), None, self.last_modified
+
+        iter_patch = mock.patch.object(
+            gmn_rest_api, "iter_data_from_url", side_effect=iter_data_from_url)
+        self.mock_iter_data_from_url = iter_patch.start()
+        self.addCleanup(iter_patch.stop)
+
+        response_patch = mock.patch.object(
+            gmn_rest_api, "_http_get_response",
+            side_effect=lambda url: (mock.Mock(), None, self.last_modified))
+        self.mock_http_get_response = response_patch.start()
+        self.addCleanup(response_patch.stop)
+
+    def test_get_data_is_cached(self) -> None:
+        """
+        Test: That get_data() and get_meteor_summary_data() fetch the same query once,
+         however its whitespace is written, but not queries with different strings.
+        When: get_data() and get_meteor_summary_data() are called with the query cache
+         enabled.
+        """
+        data, last_modified = gmn_rest_api.get_data("SELECT *\n  FROM meteor")
+        self.assertEqual((data, last_modified),
+                         gmn_rest_api.get_data(" SELECT * FROM meteor "))
+        self.assertEqual(self.last_modified, last_modified)
+        gmn_rest_api.get_data("SELECT * FROM meteor WHERE iau_code = 'PER  '")
+        gmn_rest_api.get_data("SELECT * FROM meteor WHERE iau_code = 'PER '")
+        self.assertEqual(3, self.mock_iter_data_from_url.call_count)
+
+        gmn_rest_api.get_meteor_summary_data(where="iau_code =  'PER'")
+        gmn_rest_api.get_meteor_summary_data(where="iau_code = 'PER'")
+        self.assertEqual(4, self.mock_iter_data_from_url.call_count)
+        self.assertEqual(1, self.mock_http_get_response.call_count)
+
+    def test_query_cache_on_disk(self) -> None:
+        """
+        Test: That pages dropped from memory and pages cached by an earlier process are
+         read from disk.
+        When: More queries than max_entries are made, and the query cache is enabled
+         again.
+        """
+        queries = [f"SELECT {i}" for i in range(3)]
+        pages = [gmn_rest_api.get_data(query) for query in queries]
+
+        gmn_rest_api.disable_query_cache()
+        gmn_rest_api.enable_query_cache(max_entries=2, directory=self.directory)
+        self.assertEqual(pages, [gmn_rest_api.get_data(query) for query in queries])
+        self.assertEqual(3, self.mock_iter_data_from_url.call_count)
+        self.assertEqual(3, len(list(self.directory.glob("*.query.gz"))))
+
+    def test_query_cache_last_modified(self) -> None:
+        """
+        Test: That cached pages are fetched again and dropped when the GMN data store
+         modifies, but not when a response has no or an older last modified date.
+        When: The last modified date of the mocked responses changes.
+        """
+        gmn_rest_api.enable_query_cache(directory=self.directory, max_age=0)
+        gmn_rest_api.get_data("SELECT 1")
+        gmn_rest_api.get_data("SELECT 2")
+        gmn_rest_api.get_data("SELECT 1")
+        self.assertEqual(2, self.mock_iter_data_from_url.call_count)
+
+        self.last_modified = "Sat, 05 Mar 2022 10:00:00 GMT"
+        self.assertEqual((mock.ANY, self.last_modified), gmn_rest_api.get_data("SELECT 1"))
+        self.assertEqual(3, self.mock_iter_data_from_url.call_count)
+        self.assertEqual(1, len(list(self.directory.glob("*.query.gz"))))
+
+        for last_modified in (None, "Fri, 04 Mar 2022 10:00:00 GMT"):
+            self.last_modified = last_modified
+            self.assertEqual((mock.ANY, "Sat, 05 Mar 2022 10:00:00 GMT"),
+                             gmn_rest_api.get_data("SELECT 1"))
+        self.assertEqual(3, self.mock_iter_data_from_url.call_count)
+        self.assertEqual(1, len(list(self.directory.glob("*.query.gz"))))
+
+        # Pages without a last modified date aren't cached
+        gmn_rest_api.clear_query_cache()
+        self.last_modified = None
+        gmn_rest_api.get_data("SELECT 1")
+        gmn_rest_api.get_data("SELECT 1")
+        self.assertEqual(5, self.mock_iter_data_from_url.call_count)
+        self.assertEqual([], list(self.directory.glob("*.query.gz")))
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,96 @@
+"""Tests for the http_transport module."""
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List
+from unittest import mock
+
+from gmn_python_api import http_transport
+from gmn_python_api.http_transport import HttpTransport
+
+
+class TestHttpTransport(unittest.TestCase):
+    """Tests for the http_transport module."""
+
+    def setUp(self) -> None:
+        """
+        Sets up the tests with a local HTTP server that responds with the status codes
+         in self.statuses in turn, then with 200 OK.
+        """
+        self.statuses: List[int] = []
+        statuses = self.statuses
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                status = statuses.pop(0) if statuses else 200
+                self.send_response(status)
+                self.send_header("Content-Length", "2")
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def tearDown(self) -> None:
+        """
+        Stops the local HTTP server.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        http_transport.set_transport(None)
+
+    def test_get_retries_server_errors(self) -> None:
+        """
+        Test: That get() retries responses with a 5xx or 429 status code, and returns the
+         last response when the retries run out.
+        When: get() is called with a local HTTP server that responds with errors.
+        """
+        with HttpTransport(retries=2, backoff_factor=0) as transport:
+            self.statuses.extend([503, 429])
+            response = transport.get(self.url)
+            self.assertEqual((200, "ok"), (response.status_code, response.text))
+
+            self.statuses.extend([500, 502, 504])
+            self.assertEqual(504, transport.get(self.url).status_code)
+
+            self.statuses.append(404)
+            self.assertEqual(404, transport.get(self.url).status_code)
+            self.assertEqual([], self.statuses)
+
+    def test_get_default_timeout(self) -> None:
+        """
+        Test: That get() and head() send requests with the timeout of the transport,
+         unless a request gives its own.
+        When: get() and head() are called with a mocked session.
+        """
+        transport = HttpTransport(timeout=5)
+        with mock.patch.object(transport.session, "get") as mock_get, \
+                mock.patch.object(transport.session, "head") as mock_head:
+            transport.get(self.url)
+            transport.get(self.url, timeout=1)
+            transport.head(self.url)
+
+        self.assertEqual([5, 1], [call[1]["timeout"] for call in mock_get.call_args_list])
+        mock_head.assert_called_once_with(self.url, timeout=5, allow_redirects=True)
+
+    def test_set_transport(self) -> None:
+        """
+        Test: That get_transport() returns the same transport until another is set with
+         set_transport().
+        When: get_transport() is called before and after set_transport().
+        """
+        transport = HttpTransport()
+        self.assertIs(http_transport.get_transport(), http_transport.get_transport())
+        http_transport.set_transport(transport)
+        self.assertIs(transport, http_transport.get_transport())
+        http_transport.set_transport(None)
+        self.assertIsNot(transport, http_transport.get_transport())
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
@@ -11,7 +11,7 @@ from gmn_python_api import iau_showers
 class TestIAUShowers(unittest.TestCase):
     """Tests for the iau_showers module."""
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     def test_get_iau_showers_bad_response(self, mock_get: mock.Mock) -> None:
         """
         Test: That get_iau_showers() raises an exception when the response is not 200.
@@ -22,7 +22,7 @@ class TestIAUShowers(unittest.TestCase):
         )
         self.assertRaises(HTTPError, iau_showers.get_iau_showers)
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     def test_get_iau_showers_retrieve(self, mock_get: mock.Mock) -> None:
         """
         Test: That get_iau_showers() returns the expected dictionary of iau information.
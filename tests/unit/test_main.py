@@ -1,8 +1,12 @@
 """Test cases for the __main__ module."""
+from pathlib import Path
+from unittest import mock
+
 import pytest
 from click.testing import CliRunner
 
 from gmn_python_api import __main__
+from gmn_python_api import data_directory
 
 
 @pytest.fixture
@@ -15,3 +19,15 @@ def test_main_succeeds(runner: CliRunner) -> None:
     """It exits with a status code of zero."""
     result = runner.invoke(__main__.main)
     assert result.exit_code == 0
+
+
+def test_mirror_succeeds(runner: CliRunner, tmp_path: Path) -> None:
+    """It mirrors the data directory to the given directory with the given options."""
+    with mock.patch("gmn_python_api.data_directory.mirror",
+                    return_value={"a": {}, "b": {}}) as mock_mirror:
+        result = runner.invoke(__main__.main, [
+            "mirror", str(tmp_path), "--since", "2018-12-09", "--compress"])
+    assert result.exit_code == 0
+    assert f"Mirrored 2 files to {tmp_path}" in result.output
+    mock_mirror.assert_called_once_with(
+        tmp_path, "2018-12-09", data_directory.DEFAULT_MAX_WORKERS, True)
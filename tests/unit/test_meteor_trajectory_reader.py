@@ -1,7 +1,19 @@
 """Tests for the meteor_trajectory_reader module."""
+import bz2
+import gzip
+import io
+import json
+import lzma
+import mmap
 import os
+import tempfile
 import unittest
 from pathlib import Path
+from typing import Callable, List, Tuple, Union
+
+import pandas as pd  # type: ignore
+import pytest
+import requests
 
 from tests.unit.expected_meteor_trajectory_reader_values import EXPECTED_COLUMN_NAMES
 from tests.unit.expected_meteor_trajectory_reader_values import EXPECTED_COLUMN_NAMES_CAMEL_CASE
@@ -9,7 +21,8 @@ from tests.unit.expected_meteor_trajectory_reader_values import EXPECTED_DTYPES
 
 from gmn_python_api import meteor_trajectory_reader as msr
 from gmn_python_api.meteor_trajectory_schema import \
-    get_model_meteor_trajectory_dataframe
+    get_model_meteor_trajectory_dataframe, \
+    _MODEL_METEOR_TRAJECTORY_FILE_PATH
 
 
 class TestMeteorTrajectoryReader(unittest.TestCase):
@@ -110,6 +123,368 @@ class TestMeteorTrajectoryReader(unittest.TestCase):
         self.assertEqual(EXPECTED_COLUMN_NAMES_CAMEL_CASE, actual_dataframe.columns.tolist())
         self.assertEqual("unique_trajectory_identifier", actual_dataframe.index.name)
 
+    def test_read_data_c_parser_matches_python_parser(self) -> None:
+        """
+        Test: That read_data produces the same dataframe as the python parser.
+        When: read_data is called with mock data directory data.
+        """
+        data = self.mock_data_directory_csv.read_text()
+        expected_dataframe = msr._read_csv_python(data, False)
+        msr._set_data_types(expected_dataframe)
+
+        pd.testing.assert_frame_equal(expected_dataframe, msr.read_data(data))
+
+    def test_read_data_with_path_bytes_and_memory_map(self) -> None:
+        """
+        Test: That read_data produces the same dataframe as when given a string.
+        When: read_data is called with a file path, bytes, a memoryview and a
+         memory-mapped file.
+        """
+        expected_dataframe = msr.read_data(self.mock_data_directory_csv.read_text())
+
+        pd.testing.assert_frame_equal(
+            expected_dataframe, msr.read_data(self.mock_data_directory_csv))
+        pd.testing.assert_frame_equal(
+            expected_dataframe, msr.read_data(self.mock_data_directory_csv.read_bytes()))
+        pd.testing.assert_frame_equal(
+            expected_dataframe,
+            msr.read_data(memoryview(self.mock_data_directory_csv.read_bytes())))
+
+        with open(self.mock_data_directory_csv, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memory_map:
+                pd.testing.assert_frame_equal(
+                    expected_dataframe, msr.read_data(memory_map))
+
+    def test_read_data_with_rest_api_rows(self) -> None:
+        """
+        Test: That read_data produces the same dataframe from REST API rows and columns as
+         from a DataFrame built from the records.
+        When: read_data is called with rows as dicts and as lists, and with a dictionary
+         of columns, and input_camel_case is True.
+        """
+        rest_api_dataframe = pd.read_csv(self.mock_rest_api_csv)
+        records = json.loads(rest_api_dataframe.to_json(orient="records"))
+        arrays = json.loads(rest_api_dataframe.to_json(orient="values"))
+        expected_dataframe = msr._convert_camel_case_to_verbose_column_names(
+            pd.DataFrame.from_records(records))
+        msr._set_data_types(expected_dataframe)
+
+        pd.testing.assert_frame_equal(
+            expected_dataframe, msr.read_data(records, input_camel_case=True))
+        pd.testing.assert_frame_equal(
+            expected_dataframe, msr.read_data(arrays, input_camel_case=True))
+        pd.testing.assert_frame_equal(
+            expected_dataframe,
+            msr.read_data(arrays, input_camel_case=True,
+                          input_columns=rest_api_dataframe.columns.tolist()))
+        pd.testing.assert_frame_equal(
+            expected_dataframe,
+            msr.read_data(rest_api_dataframe.to_dict(orient="list"), input_camel_case=True))
+
+        actual_dataframe = msr.read_data(arrays, input_camel_case=True,
+                                         columns=["vgeo_km_s"], where={"iau_code": "OAV"})
+        self.assertEqual((6, 1), actual_dataframe.shape)
+        self.assertEqual("float64", actual_dataframe["Vgeo (km/s)"].dtype)
+
+    def test_read_data_with_compressed_data(self) -> None:
+        """
+        Test: That read_data and read_data_iter produce the same dataframe from
+         compressed data as from uncompressed data.
+        When: read_data is called with gzip, bzip2, xz and zstd compressed files and
+         bytes, and read_data_iter with a compressed stream.
+        """
+        zstandard = pytest.importorskip("zstandard")
+        data = self.mock_data_directory_csv.read_bytes()
+        expected_dataframe = msr.read_data(self.mock_data_directory_csv)
+
+        compressors: List[Tuple[str, Callable[[bytes], bytes]]] = [
+            ("gz", gzip.compress),
+            ("bz2", bz2.compress),
+            ("xz", lzma.compress),
+            ("zst", zstandard.ZstdCompressor().compress),
+        ]
+        for suffix, compress in compressors:
+            with self.subTest(suffix), tempfile.TemporaryDirectory() as directory:
+                compressed_data = compress(data)
+                path = Path(directory, f"traj_summary.txt.{suffix}")
+                path.write_bytes(compressed_data)
+
+                pd.testing.assert_frame_equal(expected_dataframe, msr.read_data(path))
+                pd.testing.assert_frame_equal(
+                    expected_dataframe, msr.read_data(compressed_data))
+                pd.testing.assert_frame_equal(
+                    expected_dataframe,
+                    pd.concat(msr.read_data_iter(io.BytesIO(compressed_data),
+                                                 chunksize=100)),
+                )
+
+    def test_read_data_with_columns_and_where(self) -> None:
+        """
+        Test: That read_data only returns the requested columns and matching rows.
+        When: read_data is called with columns and where using verbose and camel case
+         column names.
+        """
+        dataframe = msr.read_data(self.mock_data_directory_csv.read_text())
+        expected_dataframe = dataframe.loc[
+            (dataframe["Beginning (UTC Time)"] >= "2018-12-12")
+            & (dataframe["Beginning (UTC Time)"] <= "2018-12-14")
+            & dataframe["IAU (code)"].isin(["GEM", "COM"])
+            & (dataframe["Vgeo (km/s)"] >= 30),
+            ["Vgeo (km/s)", "IAU (code)", "Participating (stations)"],
+        ]
+
+        actual_dataframe = msr.read_data(
+            self.mock_data_directory_csv.read_text(),
+            columns=["vgeo_km_s", "IAU (code)", "Participating (stations)"],
+            where={
+                "Beginning (UTC Time)": ("2018-12-12", "2018-12-14"),
+                "iau_code": ["GEM", "COM"],
+                "Vgeo (km/s)": (30, None),
+            },
+        )
+
+        self.assertEqual((83, 3), actual_dataframe.shape)
+        pd.testing.assert_frame_equal(expected_dataframe, actual_dataframe)
+
+    def test_read_data_with_unknown_column(self) -> None:
+        """
+        Test: That read_data raises a ValueError.
+        When: read_data is called with a column that doesn't exist.
+        """
+        self.assertRaises(ValueError, msr.read_data, self.mock_data_directory_csv,
+                          columns=["unknown_column"])
+
+    def test_read_data_with_compact_stations(self) -> None:
+        """
+        Test: That the compact stations column expands to the default stations column.
+        When: read_data is called with compact_stations=True and expand_stations is
+         called on the stations column.
+        """
+        expected_stations = msr.read_data(
+            self.mock_data_directory_csv)["Participating (stations)"]
+        compact_stations = msr.read_data(
+            self.mock_data_directory_csv,
+            compact_stations=True)["Participating (stations)"]
+
+        self.assertEqual("category", compact_stations.dtype)
+        self.assertEqual("US0002,US0008", compact_stations.iloc[0])
+        pd.testing.assert_series_equal(
+            expected_stations, msr.expand_stations(compact_stations))
+
+    def test_get_stations_csr(self) -> None:
+        """
+        Test: That get_stations_csr produces arrays that give the stations of each row.
+        When: get_stations_csr is called with compact and list stations columns.
+        """
+        expected_stations = msr.read_data(
+            self.mock_data_directory_csv)["Participating (stations)"]
+        compact_stations = msr.read_data(
+            self.mock_data_directory_csv,
+            compact_stations=True)["Participating (stations)"]
+
+        for stations in (expected_stations, compact_stations):
+            vocabulary, offsets, indices = msr.get_stations_csr(stations)
+
+            self.assertEqual(6, len(vocabulary))
+            self.assertEqual(len(stations) + 1, len(offsets))
+            self.assertEqual(
+                expected_stations.tolist(),
+                [vocabulary[indices[start:end]].tolist()
+                 for start, end in zip(offsets[:-1], offsets[1:])],  # noqa: B905
+            )
+
+    def test_get_stations_csr_with_missing_stations(self) -> None:
+        """
+        Test: That get_stations_csr gives no stations for rows with missing stations.
+        When: get_stations_csr is called with compact and list stations columns with a
+         missing value.
+        """
+        expected_stations = msr.read_data(
+            self.mock_data_directory_csv)["Participating (stations)"]
+        expected_stations.iloc[1] = None
+        compact_stations = msr.read_data(
+            self.mock_data_directory_csv,
+            compact_stations=True)["Participating (stations)"]
+        compact_stations.iloc[1] = None
+
+        for stations in (expected_stations, compact_stations):
+            vocabulary, offsets, indices = msr.get_stations_csr(stations)
+
+            self.assertEqual(
+                [[] if row is None else row for row in expected_stations],
+                [vocabulary[indices[start:end]].tolist()
+                 for start, end in zip(offsets[:-1], offsets[1:])],  # noqa: B905
+            )
+
+        vocabulary, offsets, indices = msr.get_stations_csr(
+            pd.Series([None, None], dtype="category"))
+        self.assertEqual(([], [0, 0, 0], []),
+                         (vocabulary.tolist(), offsets.tolist(), indices.tolist()))
+
+    def test_read_data_with_compact_dtype_profile(self) -> None:
+        """
+        Test: That read_data downcasts columns without losing their precision.
+        When: get_model_meteor_trajectory_dataframe is called with
+         dtype_profile="compact".
+        """
+        expected_dataframe = get_model_meteor_trajectory_dataframe()
+        actual_dataframe = get_model_meteor_trajectory_dataframe(dtype_profile="compact")
+
+        self.assertEqual("float32", actual_dataframe["+/- (sigma.4)"].dtype)
+        self.assertEqual("float32", actual_dataframe["Peak (AbsMag)"].dtype)
+        self.assertEqual("float64", actual_dataframe["Beginning (Julian date)"].dtype)
+        self.assertEqual("float64", actual_dataframe["Vgeo (km/s)"].dtype)
+        self.assertEqual("int16", actual_dataframe["IAU (No)"].dtype)
+        self.assertEqual("category", actual_dataframe["IAU (code)"].dtype)
+        self.assertEqual("category", actual_dataframe["Participating (stations)"].dtype)
+        self.assertLess(actual_dataframe.memory_usage(deep=True).sum(),
+                        expected_dataframe.memory_usage(deep=True).sum())
+        pd.testing.assert_frame_equal(
+            expected_dataframe.drop(columns="Participating (stations)"),
+            actual_dataframe.drop(columns="Participating (stations)"),
+            check_dtype=False,
+            check_categorical=False,
+            rtol=1e-6,
+        )
+
+    def test_read_data_with_unknown_dtype_profile(self) -> None:
+        """
+        Test: That read_data raises a ValueError.
+        When: read_data is called with a dtype_profile that doesn't exist.
+        """
+        self.assertRaises(ValueError, msr.read_data, self.mock_data_directory_csv,
+                          dtype_profile="unknown")
+
+    def test_read_data_field_of_view_values(self) -> None:
+        """
+        Test: That read_data keeps the False values of the field of view columns.
+        When: read_data is called with the model meteor trajectory file.
+        """
+        actual_dataframe = get_model_meteor_trajectory_dataframe()
+
+        self.assertEqual(4, (~actual_dataframe["Beg in (FOV)"]).sum())
+        self.assertEqual(4, (~actual_dataframe["End in (FOV)"]).sum())
+
+    def test_read_many(self) -> None:
+        """
+        Test: That read_many concatenates the files in order without duplicate rows.
+        When: read_many is called with overlapping files in a process pool and in the
+         current process, given as path objects, bytes and path strings.
+        """
+        model_dataframe = get_model_meteor_trajectory_dataframe()
+        data_directory_dataframe = msr.read_data(self.mock_data_directory_csv)
+        sources: List[Union[Path, bytes]] = [
+            self.mock_data_directory_csv,
+            _MODEL_METEOR_TRAJECTORY_FILE_PATH,
+            self.mock_data_directory_csv.read_bytes(),
+        ]
+
+        for workers in (2, 1):
+            actual_dataframe = msr.read_many(sources, workers=workers)
+
+            pd.testing.assert_frame_equal(
+                pd.concat([data_directory_dataframe, model_dataframe]), actual_dataframe)
+
+        actual_dataframe = msr.read_many(sources, workers=2, compact_stations=True)
+        self.assertEqual("category", actual_dataframe["Participating (stations)"].dtype)
+        self.assertEqual((0, 85), msr.read_many([]).shape)
+
+        actual_dataframe = msr.read_many(
+            [str(self.mock_data_directory_csv), str(_MODEL_METEOR_TRAJECTORY_FILE_PATH)],
+            workers=2)
+        pd.testing.assert_frame_equal(
+            pd.concat([data_directory_dataframe, model_dataframe]), actual_dataframe)
+
+    def test_to_parquet_and_read_parquet(self) -> None:
+        """
+        Test: That read_parquet produces the dataframe written by to_parquet.
+        When: to_parquet and read_parquet are called with mock data directory data.
+        """
+        expected_dataframe = msr.read_data(self.mock_data_directory_csv)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "traj_summary_monthly_201812.parquet")
+            msr.to_parquet(expected_dataframe, path)
+
+            pd.testing.assert_frame_equal(expected_dataframe, msr.read_parquet(path))
+
+    def test_read_parquet_with_columns_and_filters(self) -> None:
+        """
+        Test: That read_parquet only reads the requested columns and rows.
+        When: read_parquet is called with columns and filters.
+        """
+        dataframe = msr.read_data(self.mock_data_directory_csv, output_camel_case=True)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "traj_summary_monthly_201812.parquet")
+            msr.to_parquet(dataframe, path)
+            actual_dataframe = msr.read_parquet(
+                path,
+                columns=["vgeo_km_s", "participating_stations"],
+                filters=[("iau_code", "==", "GEM")],
+            )
+
+        self.assertEqual((200, 2), actual_dataframe.shape)
+        self.assertEqual("unique_trajectory_identifier", actual_dataframe.index.name)
+        self.assertEqual(
+            dataframe.loc[actual_dataframe.index, "participating_stations"].tolist(),
+            actual_dataframe["participating_stations"].tolist(),
+        )
+
+    def test_read_data_iter_with_file_path(self) -> None:
+        """
+        Test: That read_data_iter yields chunks that combine into the read_data
+         dataframe.
+        When: read_data_iter is called with a file path and chunksize.
+        """
+        chunks = list(msr.read_data_iter(self.mock_data_directory_csv, chunksize=100))
+
+        self.assertEqual([100, 100, 100, 100, 97], [len(chunk) for chunk in chunks])
+        pd.testing.assert_frame_equal(
+            msr.read_data(self.mock_data_directory_csv.read_text()), pd.concat(chunks)
+        )
+
+    def test_read_data_iter_with_response_stream_camel_case(self) -> None:
+        """
+        Test: That read_data_iter yields camel case chunks from an HTTP response stream.
+        When: read_data_iter is called with a requests.Response and output_camel_case is
+         True.
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(self.mock_data_directory_csv.read_bytes())
+
+        actual_dataframe = pd.concat(
+            msr.read_data_iter(response, chunksize=200, output_camel_case=True))
+
+        self.assertEqual((497, 85), actual_dataframe.shape)
+        self.assertEqual(EXPECTED_DTYPES, actual_dataframe.dtypes.tolist())
+        self.assertEqual(EXPECTED_COLUMN_NAMES_CAMEL_CASE, actual_dataframe.columns.tolist())
+        self.assertEqual("unique_trajectory_identifier", actual_dataframe.index.name)
+
+    def test_read_data_iter_with_columns_and_where(self) -> None:
+        """
+        Test: That read_data_iter only yields the requested columns and matching rows.
+        When: read_data_iter is called with columns and where.
+        """
+        chunks = list(msr.read_data_iter(
+            self.mock_data_directory_csv,
+            chunksize=100,
+            columns=["e"],
+            where={"IAU (code)": "COM"},
+        ))
+
+        self.assertEqual(17, sum(len(chunk) for chunk in chunks))
+        self.assertTrue(all(chunk.columns.tolist() == ["e"] for chunk in chunks))
+
+    def test_read_data_iter_without_headers(self) -> None:
+        """
+        Test: That read_data_iter raises a ValueError.
+        When: read_data_iter is called with a binary stream without column headers.
+        """
+        self.assertRaises(
+            ValueError, list, msr.read_data_iter(io.BytesIO(b"a;b\n1;2\n")))
+
 
 if __name__ == "__main__":
     unittest.main()  # pragma: no cover